@@ -1,486 +1,574 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, filedialog
-from PIL import Image, ImageTk
-from openpyxl import Workbook, load_workbook
-import os, hashlib
-
-# --------------------------------------- CONFIG ---------------------------------------
-BG_COLOR = '#1A1A2E'
-FG_COLOR = '#F0A500'
-CARD_BG = '#243447'
-BTN_BG = '#F0A500'
-BTN_FG = '#1A1A2E'
-ENTRY_BG = '#2E2E3C'
-ENTRY_FG = 'white'
-BTN_WIDTH = 20
-BTN_HEIGHT = 2
-
-EXCEL_FILE = 'animal_data.xlsx'
-ADMIN_USER = 'admin'
-ADMIN_PASS_HASH = hashlib.sha256('1234'.encode()).hexdigest()
-
-# ----------------------------------- UTIL FUNCTIONS ----------------------------------
-def ensure_excel():
-    if not os.path.exists(EXCEL_FILE):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'Animals'
-        ws.append(['ID','Name','Species','Age','Description','Photo'])
-        wb.create_sheet('Users')
-        wb['Users'].append(['Username','PasswordHash','Email'])
-        wb.create_sheet('Adoptions')
-        wb['Adoptions'].append(['Animal ID','Animal Name','Adopter Username','Adopter Email'])
-        wb.create_sheet('AdoptionRequests')
-        wb['AdoptionRequests'].append(['Animal ID','Animal Name','Username','User Email'])
-        wb.save(EXCEL_FILE)
-
-
-def hash_pw(pw):
-    return hashlib.sha256(pw.encode()).hexdigest()
-
-def load_image(path, size=(200, 200)):
-    if path and os.path.exists(path):
-        try:
-            img = Image.open(path).resize(size)
-            return ImageTk.PhotoImage(img)
-        except Exception as e:
-            print(f"Failed to load image {path}: {e}")
-            return None
-    else:
-        print(f"Image path not found: {path}")
-        return None
-
-
-
-def confirm(title, msg):
-    return messagebox.askyesno(title, msg)
-
-# ------------------------------------ MAIN APP ------------------------------------
-class AnimalRescueHub:
-    def __init__(self, root):
-        self.root = root
-        root.title('Animal Rescue & Adoption Hub')
-        root.state('zoomed')
-        root.configure(bg=BG_COLOR)
-        ensure_excel()
-        self.current_user = None
-        self.setup_style()
-        self.show_main_menu()
-        self.img_refs = []
-
-
-    def setup_style(self):
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure('TButton', background=BTN_BG, foreground=BTN_FG, font=('Arial', 12, 'bold'))
-        style.map('TButton', background=[('active', FG_COLOR)])
-        style.configure('TEntry', fieldbackground=ENTRY_BG, foreground=ENTRY_FG)
-        style.configure('Treeview', background=CARD_BG, fieldbackground=CARD_BG, foreground='white', rowheight=25)
-        style.configure('Treeview.Heading', font=('Arial', 14, 'bold'), background=CARD_BG, foreground=FG_COLOR)
-
-    def clear(self):
-        for w in self.root.winfo_children(): w.destroy()
-
-    # --------------------------- Main Menu ---------------------------
-    def show_main_menu(self):
-        self.clear()
-        lbl = tk.Label(self.root, text='🐾 Animal Adoption Hub 🐾', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 36, 'bold'))
-        lbl.pack(pady=60)
-        for txt, cmd in [('Admin Login', self.show_admin_login), ('User Login', self.show_user_login), ('User Register', self.show_user_register)]:
-            btn = ttk.Button(self.root, text=txt, command=cmd)
-            btn.pack(pady=20, ipadx=30, ipady=10)
-
-    # --------------------------- Admin Flow ---------------------------
-    def show_admin_login(self):
-        self.clear()
-        tk.Label(self.root, text='Admin Login', bg=BG_COLOR, fg=FG_COLOR, font=('Arial',30,'bold')).pack(pady=40)
-        self.admin_user = self.create_entry('Username')
-        self.admin_pass = self.create_entry('Password', show='*')
-        ttk.Button(self.root, text='Login', command=self.check_admin).pack(pady=20)
-        ttk.Button(self.root, text='⬅️ Back', command=self.show_main_menu).pack(pady=10)
-
-    def check_admin(self):
-        if self.admin_user.get()==ADMIN_USER and hash_pw(self.admin_pass.get())==ADMIN_PASS_HASH:
-            self.show_admin_dashboard()
-        else:
-            messagebox.showerror('Error','Invalid credentials')
-
-    def show_admin_dashboard(self):
-        self.clear()
-        # notify pending requests
-        wb = load_workbook(EXCEL_FILE); cnt = wb['AdoptionRequests'].max_row-1
-        if cnt>0: messagebox.showinfo('Pending Requests',f'You have {cnt} adoption request(s)')
-        tk.Label(self.root, text='Admin Dashboard', bg=BG_COLOR, fg=FG_COLOR, font=('Arial',32,'bold')).pack(pady=30)
-        for txt, cmd in [('Add Animal', self.add_animal), 
-                         ('View Animals', self.view_animals), 
-                         ('Delete Animal', self.delete_animal), 
-                         ('Upload Photo', self.upload_photo), 
-                         ('View Requests', self.view_adoption_requests), 
-                         ('View Adoptions', self.view_adoptions),
-                           ('Logout', self.logout)]:
-            ttk.Button(self.root, text=txt, command=cmd, width=BTN_WIDTH).pack(pady=10, ipadx=20)
-
-    def logout(self):
-        if confirm('Logout','Confirm logout?'): self.show_main_menu()
-
-    # --------------------------- Animal Management ---------------------------
-    def add_animal(self):
-        w=tk.Toplevel(self.root); w.title('Add Animal'); w.configure(bg=BG_COLOR)
-        entries={}
-        for field in ['Name','Species','Age','Description']:
-            tk.Label(w,text=field, bg=BG_COLOR, fg=FG_COLOR).pack(pady=5)
-            entries[field] = ttk.Entry(w)
-            entries[field].pack(pady=5)
-        def save():
-            wb=load_workbook(EXCEL_FILE); ws=wb['Animals']; nid=ws.max_row
-            vals=[entries[f].get() for f in entries]
-            if all(vals): ws.append([nid]+vals+['']); wb.save(EXCEL_FILE); messagebox.showinfo('Added','Animal added'); w.destroy()
-            else: messagebox.showerror('Error','Fill all fields')
-        ttk.Button(w,text='Save', command=save).pack(pady=20)
-        ttk.Button(w,text='⬅️ Back', command=w.destroy).pack(pady=5)
-
-    def view_animals(self):
-        w = tk.Toplevel(self.root)
-        w.title('All Animals')
-        w.state('zoomed')
-        w.configure(bg=BG_COLOR)
-
-        tk.Label(w, text='All Animals', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
-
-        frame = tk.Frame(w, bg=BG_COLOR)
-        frame.pack(fill='both', expand=True)
-
-        canvas = tk.Canvas(frame, bg=BG_COLOR)
-        sb = ttk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-        cont = tk.Frame(canvas, bg=BG_COLOR)
-        cont.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-        canvas.create_window((0, 0), window=cont, anchor='nw')
-        canvas.configure(yscrollcommand=sb.set)
-
-        canvas.pack(side='left', fill='both', expand=True)
-        sb.pack(side='right', fill='y')
-
-        self.img_refs.clear()  # clear any old images before loading new ones
-
-        wb = load_workbook(EXCEL_FILE)
-        ws = wb['Animals']
-
-        r, c = 0, 0
-        for aid, name, species, age, desc, photo in ws.iter_rows(min_row=2, values_only=True):
-            card = tk.Frame(cont, bg=CARD_BG, bd=3, relief='ridge')
-            card.grid(row=r, column=c, padx=20, pady=20)
-
-            # Animal image
-            if photo and os.path.exists(photo):
-                img = load_image(photo, (200, 200))
-                if img:
-                    img_label = tk.Label(card, image=img, bg=CARD_BG)
-                    img_label.pack(pady=10)
-                    self.img_refs.append(img)  # keep reference
-            else:
-                tk.Label(card, text='No Photo Available', bg=CARD_BG, fg=FG_COLOR, font=('Arial', 14, 'italic')).pack(pady=10)
-
-            # Animal details
-            tk.Label(card, text=f'ID: {aid}', bg=CARD_BG, fg=FG_COLOR, font=('Arial', 16, 'bold')).pack(pady=3)
-            tk.Label(card, text=f'Name: {name}', bg=CARD_BG, fg=FG_COLOR, font=('Arial', 14)).pack(pady=2)
-            tk.Label(card, text=f'Species: {species}', bg=CARD_BG, fg=FG_COLOR, font=('Arial', 14)).pack(pady=2)
-            tk.Label(card, text=f'Age: {age}', bg=CARD_BG, fg=FG_COLOR, font=('Arial', 14)).pack(pady=2)
-            tk.Label(card, text=f'Description: {desc}', bg=CARD_BG, fg=FG_COLOR, wraplength=250, justify='center').pack(pady=5)
-
-            c += 1
-            if c >= 6:  # 2 cards per row
-                c = 0
-                r += 1
-
-        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(pady=20)
-
-
-    def delete_animal(self):
-        if not confirm('Delete','Delete selected animal?'): return
-        aid=simpledialog.askinteger('Delete','Animal ID:')
-        if not aid: return
-        wb=load_workbook(EXCEL_FILE); ws=wb['Animals']
-        for row in ws.iter_rows(min_row=2):
-            if row[0].value==aid: ws.delete_rows(row[0].row); wb.save(EXCEL_FILE); messagebox.showinfo('Deleted','Animal removed'); return
-        messagebox.showerror('Error','ID not found')
-
-    def upload_photo(self):
-        aid=simpledialog.askinteger('Photo','Animal ID:'); wb=load_workbook(EXCEL_FILE); ws=wb['Animals']
-        for row in ws.iter_rows(min_row=2):
-            if row[0].value==aid:
-                path=filedialog.askopenfilename(filetypes=[('Image','*.png *.jpg')])
-                if path: row[5].value=path; wb.save(EXCEL_FILE); messagebox.showinfo('Done','Photo added')
-                return
-        messagebox.showerror('Error','ID not found')
-
-    # --------------------------- Adoption Requests ---------------------------
-    def view_adoption_requests(self):
-        w = tk.Toplevel(self.root)
-        w.title('Adoption Requests')
-        w.state('zoomed')
-        w.configure(bg=BG_COLOR)
-
-        tk.Label(w, text='Adoption Requests', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
-
-        frame = tk.Frame(w, bg=BG_COLOR)
-        frame.pack(fill='both', expand=True)
-
-        canvas = tk.Canvas(frame, bg=BG_COLOR)
-        sb = ttk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-        cont = tk.Frame(canvas, bg=BG_COLOR)
-        cont.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-        canvas.create_window((0, 0), window=cont, anchor='nw')
-        canvas.configure(yscrollcommand=sb.set)
-
-        canvas.pack(side='left', fill='both', expand=True)
-        sb.pack(side='right', fill='y')
-
-        self.img_refs.clear()
-        wb = load_workbook(EXCEL_FILE)
-        wsA = wb['Animals']
-        wsR = wb['AdoptionRequests']
-
-        animal_photos = {r[0]: r[5] for r in wsA.iter_rows(min_row=2, values_only=True)}
-
-        r, c = 0, 0
-        def process_request(aid, name, user, email, action):
-            wsAd = wb['Adoptions']
-            if action == 'accept':
-                wsAd.append([aid, name, user, email])
-                messagebox.showinfo('Accepted', f'{name} adopted by {user}')
-            for row in wsR.iter_rows(min_row=2):
-                if row[0].value == aid and row[2].value == user:
-                    wsR.delete_rows(row[0].row)
-                    break
-            wb.save(EXCEL_FILE)
-            w.destroy()
-            self.view_adoption_requests()
-
-        for aid, name, user, email in wsR.iter_rows(min_row=2, values_only=True):
-            card = tk.Frame(cont, bg=CARD_BG, bd=3, relief='ridge')
-            card.grid(row=r, column=c, padx=10, pady=10)
-
-            photo = animal_photos.get(aid)
-            img = load_image(photo, (180, 180)) if photo and os.path.exists(photo) else None
-            if img:
-                img_label = tk.Label(card, image=img, bg=CARD_BG)
-                img_label.pack(pady=5)
-                self.img_refs.append(img)
-            else:
-                tk.Label(card, text='No Photo', bg=CARD_BG, fg=FG_COLOR).pack(pady=5)
-
-            tk.Label(card, text=f'ID: {aid}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Name: {name}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'User: {user}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Email: {email}', bg=CARD_BG, fg=FG_COLOR).pack()
-
-            ttk.Button(card, text='Accept', command=lambda a=aid, n=name, u=user, e=email: process_request(a, n, u, e, 'accept')).pack(pady=3)
-            ttk.Button(card, text='Reject', command=lambda a=aid, n=name, u=user, e=email: process_request(a, n, u, e, 'reject')).pack(pady=3)
-
-            c += 1
-            if c >= 6:
-                c = 0
-                r += 1
-
-        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(pady=20)
-
-
-    def view_adoptions(self):
-        w = tk.Toplevel(self.root)
-        w.title('Adoptions')
-        w.state('zoomed')
-        w.configure(bg=BG_COLOR)
-
-        tk.Label(w, text='Completed Adoptions', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
-
-        frame = tk.Frame(w, bg=BG_COLOR)
-        frame.pack(fill='both', expand=True)
-
-        canvas = tk.Canvas(frame, bg=BG_COLOR)
-        sb = ttk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-        cont = tk.Frame(canvas, bg=BG_COLOR)
-        cont.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-        canvas.create_window((0, 0), window=cont, anchor='nw')
-        canvas.configure(yscrollcommand=sb.set)
-
-        canvas.pack(side='left', fill='both', expand=True)
-        sb.pack(side='right', fill='y')
-
-        self.img_refs.clear()
-        wb = load_workbook(EXCEL_FILE)
-        wsA = wb['Animals']
-        wsAd = wb['Adoptions']
-
-        animal_photos = {r[0]: r[5] for r in wsA.iter_rows(min_row=2, values_only=True)}
-
-        r, c = 0, 0
-        for aid, name, user, email in wsAd.iter_rows(min_row=2, values_only=True):
-            card = tk.Frame(cont, bg=CARD_BG, bd=3, relief='ridge')
-            card.grid(row=r, column=c, padx=10, pady=10)
-
-            photo = animal_photos.get(aid)
-            img = load_image(photo, (180, 180)) if photo and os.path.exists(photo) else None
-            if img:
-                img_label = tk.Label(card, image=img, bg=CARD_BG)
-                img_label.pack(pady=5)
-                self.img_refs.append(img)
-            else:
-                tk.Label(card, text='No Photo', bg=CARD_BG, fg=FG_COLOR).pack(pady=5)
-
-            tk.Label(card, text=f'ID: {aid}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Name: {name}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'User: {user}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Email: {email}', bg=CARD_BG, fg=FG_COLOR).pack()
-
-            c += 1
-            if c >= 6:
-                c = 0
-                r += 1
-
-        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(pady=20)
-
-
-    # --------------------------- User Flow ---------------------------
-    def show_user_register(self):
-        self.clear(); tk.Label(self.root,text='Register',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',30,'bold')).pack(pady=30)
-        self.r_u=self.create_entry('Username'); self.r_e=self.create_entry('Email'); self.r_p=self.create_entry('Password',show='*')
-        ttk.Button(self.root,text='Register',command=self.register_user).pack(pady=20)
-        ttk.Button(self.root,text='⬅️ Back',command=self.show_main_menu).pack(pady=10)
-
-    def register_user(self):
-        u,e,p=self.r_u.get(),self.r_e.get(),self.r_p.get()
-        if all([u,e,p]):
-            wb=load_workbook(EXCEL_FILE); ws=wb['Users']; ws.append([u,hash_pw(p),e]); wb.save(EXCEL_FILE)
-            messagebox.showinfo('Done','Registered'); self.show_main_menu()
-        else: messagebox.showerror('Error','Fill all')
-
-    def show_user_login(self):
-        self.clear(); tk.Label(self.root,text='User Login',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',30,'bold')).pack(pady=30)
-        self.l_u=self.create_entry('Username'); self.l_p=self.create_entry('Password',show='*')
-        ttk.Button(self.root,text='Login',command=self.check_user).pack(pady=20)
-        ttk.Button(self.root,text='⬅️ Back',command=self.show_main_menu).pack(pady=10)
-
-    def check_user(self):
-        u,p=self.l_u.get(),hash_pw(self.l_p.get()); ws=load_workbook(EXCEL_FILE)['Users']
-        for r in ws.iter_rows(min_row=2,values_only=True):
-            if r[0]==u and r[1]==p: self.current_user=(u,r[2]); self.show_user_dashboard(); return
-        messagebox.showerror('Error','Invalid cred')
-
-    def show_user_dashboard(self):
-        self.clear(); tk.Label(self.root,text=f'Welcome {self.current_user[0]}',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',32,'bold')).pack(pady=30)
-        ws=load_workbook(EXCEL_FILE)['Adoptions']; adopted=[(r[0],r[1]) for r in ws.iter_rows(min_row=2,values_only=True) if r[2]==self.current_user[0]]
-        if adopted:
-            tk.Label(self.root,text='Your Adoptions',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',24,'bold')).pack(pady=10)
-            for aid,name in adopted: tk.Label(self.root,text=f'ID:{aid} {name}',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',20)).pack(pady=5)
-        else:
-            tk.Label(self.root,text='No adoptions yet',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',20)).pack(pady=10)
-        ttk.Button(self.root,text='Request Adoption',command=self.adopt_dialog).pack(pady=20)
-        ttk.Button(self.root,text='⬅️ Logout',command=self.show_main_menu).pack(pady=10)
-
-    def adopt_dialog(self):
-    # 1) Clear out any existing widgets on the main window
-        self.clear()
-        self.root.title('Choose Animal')
-        self.root.state('zoomed')
-        self.root.configure(bg=BG_COLOR)
-
-    # 2) Header
-        tk.Label(self.root, text='Choose Animal', bg=BG_COLOR, fg=FG_COLOR,
-             font=('Arial', 28, 'bold')).pack(pady=20)
-
-    # 3) Scrollable card container
-        frame = tk.Frame(self.root, bg=BG_COLOR)
-        frame.pack(fill='both', expand=True)
-        canvas = tk.Canvas(frame, bg=BG_COLOR)
-        sb = ttk.Scrollbar(frame, orient='vertical', command=canvas.yview)
-        cont = tk.Frame(canvas, bg=BG_COLOR)
-        cont.bind('<Configure>', lambda e: canvas.configure(scrollregion=canvas.bbox('all')))
-        canvas.create_window((0, 0), window=cont, anchor='nw')
-        canvas.configure(yscrollcommand=sb.set)
-        canvas.pack(side='left', fill='both', expand=True)
-        sb.pack(side='right', fill='y')
-
-    # 4) Load data
-        wb = load_workbook(EXCEL_FILE)
-        wsA = wb['Adoptions']
-        wsR = wb['AdoptionRequests']
-        ws  = wb['Animals']
-        adopted   = {r[0] for r in wsA.iter_rows(min_row=2, values_only=True)}
-        requested = {(r[0], r[2]) for r in wsR.iter_rows(min_row=2, values_only=True)}
-
-    # 5) Build cards
-        r = c = 0
-        self.img_refs.clear()
-        for aid, name, species, age, desc, photo in ws.iter_rows(min_row=2, values_only=True):
-            card = tk.Frame(cont, bg=CARD_BG, bd=3, relief='ridge')
-            card.grid(row=r, column=c, padx=10, pady=10)
-
-            # Photo
-            img = load_image(photo, (200,200))
-            if img:
-                tk.Label(card, image=img, bg=CARD_BG).pack(pady=5)
-                self.img_refs.append(img)
-            else:
-                tk.Label(card, text='No Photo', bg=CARD_BG, fg=FG_COLOR).pack(pady=20)
-
-            # Details
-            tk.Label(card, text=f'{name} ({species})', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Age: {age}', bg=CARD_BG, fg=FG_COLOR).pack()
-            tk.Label(card, text=f'Description: {desc}', bg=CARD_BG, fg=FG_COLOR,
-                 wraplength=200, justify='center').pack(pady=5)
-
-            # Request / Status
-            if aid in adopted:
-                status = 'Adopted'
-            elif (aid, self.current_user[0]) in requested:
-                status = 'Pending'
-            else:
-                status = ''
-
-            if not status:
-            # Pass only aid & name to send_request
-                btn = ttk.Button(card,
-                             text='Request',
-                             command=lambda a=aid, n=name: self.send_request(a, n))
-                btn.pack(pady=5)
-            else:
-                tk.Label(card, text=status, bg=CARD_BG, fg='red').pack(pady=5)
-
-            c += 1
-            if c >= 6:
-                c = 0
-                r += 1
-
-    # 6) Back button
-        ttk.Button(self.root, text='⬅️ Back', command=self.show_user_dashboard).pack(pady=20)
-
-
-
-
-    def send_request(self, aid, name):
-        wb = load_workbook(EXCEL_FILE)
-        ws = wb['AdoptionRequests']
-        ws.append([aid, name, self.current_user[0], self.current_user[1]])
-        wb.save(EXCEL_FILE)
-        messagebox.showinfo('Requested', f'Request sent for {name}')
-        # Navigate back to the user dashboard
-        self.show_user_dashboard()
-
-
-
-    # helper to create entries
-    def create_entry(self, placeholder, show=None):
-        ent=ttk.Entry(self.root, show=show if show else '')
-        ent.insert(0, placeholder)
-        ent.pack(pady=5)
-        def on_in(e):
-            if ent.get()==placeholder: ent.delete(0,tk.END)
-        def on_out(e):
-            if not ent.get(): ent.insert(0, placeholder)
-        ent.bind('<FocusIn>',on_in); ent.bind('<FocusOut>',on_out)
-        return ent
-
-if __name__=='__main__':
-    root=tk.Tk(); 
-    app=AnimalRescueHub(root); 
-    root.mainloop()
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import time
+STARTED = time.perf_counter()   # for the startup milestones below
+from concurrent.futures import Future
+from storage import EXCEL_FILE
+from service import RescueService, ServiceError
+from thumbs import ThumbnailCache, GRID_SIZE, CARD_SIZE
+from grid import VirtualGrid, PAGE_SIZE
+from search import SORT_KEYS
+from status import ADOPTED
+from tasks import TaskRunner
+import bulk, perf
+import os
+
+# --------------------------------------- CONFIG ---------------------------------------
+BG_COLOR = '#1A1A2E'
+FG_COLOR = '#F0A500'
+CARD_BG = '#243447'
+BTN_BG = '#F0A500'
+BTN_FG = '#1A1A2E'
+ENTRY_BG = '#2E2E3C'
+ENTRY_FG = 'white'
+BTN_WIDTH = 20
+BTN_HEIGHT = 2
+
+DATA_FILE = os.environ.get('RESCUE_DATA', EXCEL_FILE)   # *.db selects the SQLite backend
+API_URL = os.environ.get('RESCUE_API')                  # set to use a shared `python api.py` server
+FLUSH_MS = 30000       # write dirty sheets back at least this often
+IDLE_FLUSH_MS = 2000   # ...or once the user has stopped clicking for this long
+PERF_PANEL_MS = 1000   # refresh interval of the admin timing panel (RESCUE_PERF=1)
+WARM_THUMBS = PAGE_SIZE  # photos decoded in the background after startup (the first page of animals)
+WARM_SIZE = GRID_SIZE    # ...at the size the animal grids show them
+
+THUMBS = ThumbnailCache()
+perf.register('thumbs', THUMBS.stats)
+
+# ----------------------------------- UTIL FUNCTIONS ----------------------------------
+def confirm(title, msg):
+    return messagebox.askyesno(title, msg)
+
+# ------------------------------------ MAIN APP ------------------------------------
+class AnimalRescueHub:
+    def __init__(self, root):
+        self.root = root
+        root.title('Animal Rescue & Adoption Hub')
+        root.state('zoomed')
+        root.configure(bg=BG_COLOR)
+        self.tasks = TaskRunner(root)
+        self.decoding = {}   # (path, size) -> cards waiting for that decode
+        self.current_user = None
+        self._svc, self._opening = Future(), False
+        self.setup_style()
+        self.show_main_menu()
+        self._idle_job = None
+        root.protocol('WM_DELETE_WINDOW', self.on_close)
+        root.after(FLUSH_MS, self.autoflush)
+        root.after_idle(self.warm_up)   # runs once the menu has been drawn
+
+    # --------------------------- Startup ---------------------------
+    # The menu needs no data, so it is drawn first; the data file is opened
+    # on the I/O thread right after, then indexes and thumbnails are warmed.
+    @property
+    def svc(self):
+        # blocks only if someone gets to the data before the background open finished
+        if not self._opening: self.warm_up()
+        return self._svc.result()
+
+    def warm_up(self):
+        if self._opening: return
+        self._opening = True
+        perf.mark('startup_menu', STARTED)
+        def open_service():
+            # the outcome is set here, not in done/failed: a worker may already be waiting on it
+            try:
+                if API_URL:
+                    from api import ApiClient   # pulls in asyncio & co; only the networked setup needs it
+                    svc = ApiClient(API_URL)
+                else:
+                    svc = RescueService.open(DATA_FILE)
+            except Exception as e:
+                self._svc.set_exception(e)
+                raise
+            self._svc.set_result(svc)
+            perf.mark('startup_data', STARTED)
+            return svc
+        def failed(e):
+            messagebox.showerror('Error', f'Could not open {API_URL or DATA_FILE}: {e}')
+        self.tasks.submit(open_service, io=True, done=lambda svc: self.tasks.submit(self.warm_caches, svc), error=failed)
+
+    def warm_caches(self, svc):
+        # worker thread: search/status indexes, then the first page of thumbnails
+        if isinstance(svc, RescueService):
+            svc.animal_index()
+            svc.adoption_status()
+        paths = []
+        for a in svc.animals(0, WARM_THUMBS):
+            if a.photo and a.photo not in paths and os.path.exists(a.photo): paths.append(a.photo)
+        THUMBS.precompute(paths)   # cold disk cache: render the page's photos on every core
+        for path in paths:
+            try: img = THUMBS.decode(path, WARM_SIZE)
+            except Exception: continue
+            self.tasks.post(THUMBS.add, path, WARM_SIZE, img)   # PhotoImages are made on the Tk thread
+        self.tasks.post(perf.mark, 'startup_warm', STARTED)
+
+
+    def setup_style(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('TButton', background=BTN_BG, foreground=BTN_FG, font=('Arial', 12, 'bold'))
+        style.map('TButton', background=[('active', FG_COLOR)])
+        style.configure('TEntry', fieldbackground=ENTRY_BG, foreground=ENTRY_FG)
+        style.configure('Treeview', background=CARD_BG, fieldbackground=CARD_BG, foreground='white', rowheight=25)
+        style.configure('Treeview.Heading', font=('Arial', 14, 'bold'), background=CARD_BG, foreground=FG_COLOR)
+
+    def clear(self):
+        for w in self.root.winfo_children(): w.destroy()
+
+    # --------------------------- Persistence ---------------------------
+    def changed(self):
+        # debounce: flush once the user has been idle for IDLE_FLUSH_MS
+        if self._idle_job: self.root.after_cancel(self._idle_job)
+        self._idle_job = self.root.after(IDLE_FLUSH_MS, self.flush)
+
+    def flush(self):
+        self._idle_job = None
+        self.tasks.submit(lambda: self.svc.flush(), io=True, error=lambda e: print(f"Failed to save {DATA_FILE}: {e}"))
+
+    def with_data(self, fn):
+        # re-check the data file on the I/O thread, then continue on the Tk thread
+        def failed(e):
+            print(f"Failed to reload {DATA_FILE}: {e}")
+            fn()   # carry on with what is already in memory
+        self.tasks.submit(lambda: self.svc.refresh(), io=True, done=lambda _: fn(), error=failed)   # svc resolved on the I/O thread
+
+    def run(self, method, *args, done=None, io=True):
+        # svc.<method>(*args), or method(*args) if it is a function, on the I/O thread
+        # (io=False: the worker pool, for CPU-heavy calls like password hashing); svc is
+        # looked up there too, so a click never waits for the data file to open.
+        # Refusals are shown to the user
+        name = getattr(method, '__name__', method)
+        def call(): return (method if callable(method) else getattr(self.svc, method))(*args)
+        call.__name__ = name
+        def failed(e):
+            if not isinstance(e, ServiceError): print(f"{name} failed: {e!r}")
+            messagebox.showerror('Error', str(e))
+        self.tasks.submit(call, io=io, done=done, error=failed)
+
+    def autoflush(self):
+        self.flush()
+        self.root.after(FLUSH_MS, self.autoflush)
+
+    def on_close(self):
+        self.tasks.shutdown()
+        # leave a complete workbook behind, journal folded in (if the data ever opened)
+        try:
+            if self._svc.done() and not self._svc.exception(): self._svc.result().checkpoint()
+        except Exception as e: print(f"Failed to save {DATA_FILE}: {e}")
+        self.root.destroy()
+
+    # --------------------------- Main Menu ---------------------------
+    def show_main_menu(self):
+        self.clear()
+        lbl = tk.Label(self.root, text='🐾 Animal Adoption Hub 🐾', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 36, 'bold'))
+        lbl.pack(pady=60)
+        for txt, cmd in [('Admin Login', self.show_admin_login), ('User Login', self.show_user_login), ('User Register', self.show_user_register)]:
+            btn = ttk.Button(self.root, text=txt, command=cmd)
+            btn.pack(pady=20, ipadx=30, ipady=10)
+
+    # --------------------------- Admin Flow ---------------------------
+    def show_admin_login(self):
+        self.clear()
+        tk.Label(self.root, text='Admin Login', bg=BG_COLOR, fg=FG_COLOR, font=('Arial',30,'bold')).pack(pady=40)
+        self.admin_user = self.create_entry('Username')
+        self.admin_pass = self.create_entry('Password', show='*')
+        ttk.Button(self.root, text='Login', command=self.check_admin).pack(pady=20)
+        ttk.Button(self.root, text='⬅️ Back', command=self.show_main_menu).pack(pady=10)
+
+    def check_admin(self):
+        self.run('admin_login', self.admin_user.get(), self.admin_pass.get(), done=lambda _: self.show_admin_dashboard(), io=False)
+
+    def show_admin_dashboard(self):
+        self.clear()
+        # notify pending requests
+        def notify(cnt):
+            if cnt>0: messagebox.showinfo('Pending Requests',f'You have {cnt} adoption request(s)')
+        self.with_data(lambda: self.run('pending_count', done=notify))
+        tk.Label(self.root, text='Admin Dashboard', bg=BG_COLOR, fg=FG_COLOR, font=('Arial',32,'bold')).pack(pady=30)
+        for txt, cmd in [('Add Animal', self.add_animal), 
+                         ('View Animals', self.view_animals), 
+                         ('Delete Animal', self.delete_animal), 
+                         ('Upload Photo', self.upload_photo), 
+                         ('View Requests', self.view_adoption_requests), 
+                         ('View Adoptions', self.view_adoptions),
+                         ('Import Animals', self.import_animals),
+                         ('Export Data', self.export_data),
+                           ('Logout', self.logout)]:
+            ttk.Button(self.root, text=txt, command=cmd, width=BTN_WIDTH).pack(pady=10, ipadx=20)
+        if perf.ENABLED: self.perf_panel()
+
+    def perf_panel(self):
+        # live timings from perf.py, refreshed until the dashboard is cleared away
+        box = tk.Label(self.root, bg=CARD_BG, fg=FG_COLOR, font=('Courier', 11), justify='left', anchor='nw')
+        box.place(relx=1.0, x=-20, y=20, anchor='ne')
+        def update():
+            if not box.winfo_exists(): return
+            snap = perf.snapshot()
+            lines = [f'{"operation":<30}{"n":>6}{"p50 ms":>10}{"p95 ms":>10}']
+            lines += [f'{op[:30]:<30}{s["count"]:>6}{s["p50"]:>10.1f}{s["p95"]:>10.1f}' for op, s in snap['ops'].items()]
+            t = snap.get('thumbs', {})
+            looked = t.get('hits', 0) + t.get('misses', 0)
+            if looked: lines.append(f'thumbnail hit rate {t["hits"] / looked:.0%} ({t["disk_hits"]} from disk)')
+            lines.append(f'image data decoded {snap["counters"].get("image_bytes_decoded", 0) / 2 ** 20:.1f} MB')
+            box.configure(text='\n'.join(lines))
+            self.root.after(PERF_PANEL_MS, update)
+        update()
+
+    def logout(self):
+        if confirm('Logout','Confirm logout?'): self.show_main_menu()
+
+    # --------------------------- Animal Management ---------------------------
+    def add_animal(self):
+        w=tk.Toplevel(self.root); w.title('Add Animal'); w.configure(bg=BG_COLOR)
+        entries={}
+        for field in ['Name','Species','Age','Description']:
+            tk.Label(w,text=field, bg=BG_COLOR, fg=FG_COLOR).pack(pady=5)
+            entries[field] = ttk.Entry(w)
+            entries[field].pack(pady=5)
+        def save():
+            def added(_): self.changed(); messagebox.showinfo('Added','Animal added'); w.destroy()
+            self.run('add_animal', *[entries[f].get() for f in entries], done=added)
+        ttk.Button(w,text='Save', command=save).pack(pady=20)
+        ttk.Button(w,text='⬅️ Back', command=w.destroy).pack(pady=5)
+
+    @perf.timed()
+    def view_animals(self):
+        w = tk.Toplevel(self.root)
+        w.title('All Animals')
+        w.state('zoomed')
+        w.configure(bg=BG_COLOR)
+
+        tk.Label(w, text='All Animals', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
+        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(side='bottom', pady=20)
+
+        def render(card, a):
+            card.show(None, [(f'ID: {a.id}', ('Arial', 16, 'bold')),
+                             (f'Name: {a.name}', ('Arial', 14)),
+                             (f'Species: {a.species}', ('Arial', 14)),
+                             (f'Age: {a.age}', ('Arial', 14)),
+                             f'Description: {a.description}'])
+            self.show_photo(card, a.photo, GRID_SIZE, 'No Photo Available')
+
+        grid = self.card_grid(w, render, (280, 420))
+        self.search_bar(w, grid)
+        self.with_data(lambda: self.page_source(grid))
+
+
+    def delete_animal(self):
+        if not confirm('Delete','Delete selected animal?'): return
+        aid=simpledialog.askinteger('Delete','Animal ID:')
+        if not aid: return
+        def deleted(_): self.changed(); messagebox.showinfo('Deleted','Animal removed')
+        self.with_data(lambda: self.run('delete_animal', aid, done=deleted))
+
+    def upload_photo(self):
+        aid=simpledialog.askinteger('Photo','Animal ID:')
+        def pick(animal):
+            if not animal: messagebox.showerror('Error','ID not found'); return
+            path=filedialog.askopenfilename(filetypes=[('Image','*.png *.jpg')])
+            if not path: return
+            def done(_):
+                self.tasks.submit(THUMBS.precompute, [path])   # every view's size is on disk before it is shown
+                self.changed(); messagebox.showinfo('Done','Photo added')
+            self.run('set_photo', aid, path, done=done)
+        self.with_data(lambda: self.run('get_animal', aid, done=pick))
+
+    # --------------------------- Bulk Import / Export ---------------------------
+    def import_animals(self):
+        path=filedialog.askopenfilename(filetypes=[('Animals','*.csv *.xlsx')])
+        if not path: return
+        w=tk.Toplevel(self.root); w.title('Import Animals'); w.configure(bg=BG_COLOR)
+        lbl=tk.Label(w, text='Starting import…', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 16)); lbl.pack(padx=40, pady=30)
+        def progress(n): self.tasks.post(lambda: lbl.winfo_exists() and lbl.configure(text=f'Read {n} rows…'))
+        def done(report):
+            self.tasks.submit(THUMBS.precompute, [a.photo for a in report.added])
+            msg=f'Added {len(report.added)} animals, rejected {len(report.rejected)} rows'
+            if report.rejected:
+                rejects=os.path.splitext(path)[0]+'.rejected.csv'
+                bulk.write_rejects(report, rejects); msg+=f'\nRejected rows: {rejects}'
+            if w.winfo_exists(): w.destroy()
+            messagebox.showinfo('Import', msg)
+        def failed(e):
+            if w.winfo_exists(): w.destroy()
+            messagebox.showerror('Import', f'Import failed: {e}')
+        self.tasks.submit(lambda: self.svc.import_animals(path, progress), io=True, done=done, error=failed)
+
+    def export_data(self):
+        path=filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel','*.xlsx')])
+        if not path: return
+        self.tasks.submit(lambda: self.svc.export_excel(path), io=True,
+                          done=lambda _: messagebox.showinfo('Export', f'Exported to {path}'),
+                          error=lambda e: messagebox.showerror('Export', f'Export failed: {e}'))
+
+    # --------------------------- Adoption Requests ---------------------------
+    @perf.timed()
+    def view_adoption_requests(self):
+        w = tk.Toplevel(self.root)
+        w.title('Adoption Requests')
+        w.state('zoomed')
+        w.configure(bg=BG_COLOR)
+
+        tk.Label(w, text='Adoption Requests', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
+        status = tk.Label(w, text='', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 16))
+        status.pack()
+        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(side='bottom', pady=20)
+
+        # accepting a request rejects the other requests for that animal, so
+        # every decision drops the decided cards plus any competitors
+        def process_request(q, action):
+            aid, name, user, email = q
+            def done(report):
+                if report.skipped:
+                    messagebox.showerror('Error', report.skipped[0][1])
+                elif action == 'accept':
+                    extra = f' ({len(report.auto_rejected)} other request(s) rejected)' if report.auto_rejected else ''
+                    status.configure(text=f'Accepted: {name} adopted by {user}{extra}')
+                else:
+                    status.configure(text=f'Rejected: {user} for {name}')
+                selected.difference_update(report.auto_rejected)
+                grid.discard(report.auto_rejected)
+                self.changed()
+            self.run('decide_many', [(aid, user, action == 'accept')], done=done)
+            selected.discard(q)
+            grid.remove(q)
+
+        # batch mode: select cards, then decide them all in one save
+        selected = set()
+        bar = tk.Frame(w, bg=BG_COLOR)
+        bar.pack(pady=10)
+        count = tk.Label(bar, text='0 selected', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 14))
+        count.pack(side='left', padx=10)
+        def select(qs=(), clear=False):
+            if clear: selected.clear()
+            selected.symmetric_difference_update(qs)
+            count.configure(text=f'{len(selected)} selected')
+            grid.refresh()
+        def decide_selected(accept):
+            if not selected: return
+            verb = 'Accept' if accept else 'Reject'
+            if not confirm('Batch decision', f'{verb} {len(selected)} selected request(s)?'): return
+            decisions = [(q.animal_id, q.username, accept) for q in selected]
+            select(clear=True)
+            self.run('decide_many', decisions, done=batch_done)
+        def batch_done(report):
+            self.changed()
+            grid.discard(report.accepted + report.rejected + report.auto_rejected)
+            lines = [f'Accepted: {len(report.accepted)}', f'Rejected: {len(report.rejected)}',
+                     f'Rejected because the animal was adopted: {len(report.auto_rejected)}']
+            if report.skipped:
+                lines.append(f'Skipped: {len(report.skipped)}')
+                lines += [f'  ID {aid} / {user}: {why}' for (aid, user), why in report.skipped[:10]]
+            status.configure(text=' · '.join(lines[:3]))
+            messagebox.showinfo('Batch Summary', '\n'.join(lines))
+        for txt, cmd in [('Select All', lambda: select(grid.items or (), clear=True)),
+                         ('Clear', lambda: select(clear=True)),
+                         ('Accept Selected', lambda: decide_selected(True)),
+                         ('Reject Selected', lambda: decide_selected(False))]:
+            ttk.Button(bar, text=txt, command=cmd).pack(side='left', padx=5)
+
+        photos = {}
+        def render(card, q):
+            aid, name, user, email = q
+            card.show(None, [f'ID: {aid}', f'Name: {name}', f'User: {user}', f'Email: {email}'],
+                      [('Accept', lambda: process_request(q, 'accept')),
+                       ('Reject', lambda: process_request(q, 'reject')),
+                       ('Unselect' if q in selected else 'Select', lambda: select([q]))],
+                      'Selected' if q in selected else '')
+            self.show_photo(card, photos.get(aid), CARD_SIZE)
+
+        grid = self.card_grid(w, render, (240, 420))
+        self.with_data(lambda: self.run(self.with_photos, 'requests', done=lambda r: (photos.update(r[1]), grid.set_items(r[0]))))
+
+
+    @perf.timed()
+    def view_adoptions(self):
+        w = tk.Toplevel(self.root)
+        w.title('Adoptions')
+        w.state('zoomed')
+        w.configure(bg=BG_COLOR)
+
+        tk.Label(w, text='Completed Adoptions', bg=BG_COLOR, fg=FG_COLOR, font=('Arial', 40, 'bold')).pack(pady=30)
+        ttk.Button(w, text='⬅️ Back', command=w.destroy).pack(side='bottom', pady=20)
+
+        photos = {}
+        def render(card, ad):
+            aid, name, user, email = ad
+            card.show(None, [f'ID: {aid}', f'Name: {name}', f'User: {user}', f'Email: {email}'])
+            self.show_photo(card, photos.get(aid), CARD_SIZE)
+
+        grid = self.card_grid(w, render, (240, 310))
+        self.with_data(lambda: self.run(self.with_photos, 'adoptions', done=lambda r: (photos.update(r[1]), grid.set_items(r[0]))))
+
+    # --------------------------- Card Grids ---------------------------
+    def card_grid(self, parent, render, card_size):
+        # pages of a fetch() source are loaded on the I/O thread, never by the mainloop
+        loader = lambda fn, done, error: self.tasks.submit(fn, io=True, done=done, error=error)
+        grid = VirtualGrid(parent, render, card_size, bg=BG_COLOR, card_bg=CARD_BG, fg=FG_COLOR, loader=loader)
+        grid.pack(fill='both', expand=True)
+        return grid
+
+    def page_source(self, grid, fetch=None):
+        # the animal count comes from the I/O thread too (an HTTP call with RESCUE_API)
+        self.run('animal_count', done=lambda n: grid.set_source(n, fetch or self.svc.animals))
+
+    def with_photos(self, method):
+        # worker: request/adoption rows plus {animal ID: photo path}, so cards need no lookups
+        rows = getattr(self.svc, method)()
+        return rows, self.svc.photos({r.animal_id for r in rows})
+
+    def search_bar(self, parent, grid, fetch=None, decorate=list):
+        # text / age range / sort over the service's search index; no filters pages through everything.
+        # fetch/decorate turn pages and results into whatever items the grid renders
+        bar = tk.Frame(parent, bg=BG_COLOR)
+        bar.pack(pady=10, before=grid)
+        tk.Label(bar, text='Search', bg=BG_COLOR, fg=FG_COLOR).pack(side='left', padx=5)
+        text = ttk.Entry(bar, width=30); text.pack(side='left', padx=5)
+        tk.Label(bar, text='Age from', bg=BG_COLOR, fg=FG_COLOR).pack(side='left', padx=5)
+        lo = ttk.Entry(bar, width=5); lo.pack(side='left')
+        tk.Label(bar, text='to', bg=BG_COLOR, fg=FG_COLOR).pack(side='left', padx=5)
+        hi = ttk.Entry(bar, width=5); hi.pack(side='left')
+        tk.Label(bar, text='Sort by', bg=BG_COLOR, fg=FG_COLOR).pack(side='left', padx=5)
+        sort = ttk.Combobox(bar, values=SORT_KEYS, width=8, state='readonly'); sort.set('id'); sort.pack(side='left')
+        def search(_=None):
+            try: ages = [float(e.get()) if e.get().strip() else None for e in (lo, hi)]
+            except ValueError: messagebox.showerror('Error', 'Age must be a number'); return
+            q = text.get().strip()
+            if not q and ages == [None, None] and sort.get() == 'id':
+                self.page_source(grid, fetch)
+            else:
+                def find(*args): return decorate(self.svc.search_animals(*args))
+                self.run(find, q, *ages, sort.get(), done=grid.set_items)
+        ttk.Button(bar, text='Search', command=search).pack(side='left', padx=10)
+        for e in (text, lo, hi): e.bind('<Return>', search)
+        sort.bind('<<ComboboxSelected>>', search)
+        return bar
+
+    def show_photo(self, card, path, size, placeholder='No Photo'):
+        # placeholder now, photo once a worker has decoded it (unless the card was recycled meanwhile)
+        if not (path and os.path.exists(path)): card.set_image(None, placeholder); return
+        photo = THUMBS.lookup(path, size)
+        if photo: card.set_image(photo); return
+        card.set_image(None, 'Loading…')
+        key, item = (path, size), card.item
+        waiting = self.decoding.setdefault(key, [])
+        waiting.append((card, item, placeholder))
+        if len(waiting) > 1: return   # already being decoded for another card
+        def done(img):
+            photo = THUMBS.add(path, size, img)
+            for c, it, _ in self.decoding.pop(key, ()):
+                if c.item is it: c.set_image(photo)
+        def failed(e):
+            print(f"Failed to load image {path}: {e}")
+            for c, it, ph in self.decoding.pop(key, ()):
+                if c.item is it: c.set_image(None, ph)
+        self.tasks.submit(THUMBS.decode, path, size, done=done, error=failed)
+
+
+    # --------------------------- User Flow ---------------------------
+    def show_user_register(self):
+        self.clear(); tk.Label(self.root,text='Register',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',30,'bold')).pack(pady=30)
+        self.r_u=self.create_entry('Username'); self.r_e=self.create_entry('Email'); self.r_p=self.create_entry('Password',show='*')
+        ttk.Button(self.root,text='Register',command=self.register_user).pack(pady=20)
+        ttk.Button(self.root,text='⬅️ Back',command=self.show_main_menu).pack(pady=10)
+
+    def register_user(self):
+        u,e,p=self.r_u.get(),self.r_e.get(),self.r_p.get()
+        def registered(_): self.changed(); messagebox.showinfo('Done','Registered'); self.show_main_menu()
+        self.run('register', u, p, e, done=registered, io=False)
+
+    def show_user_login(self):
+        self.clear(); tk.Label(self.root,text='User Login',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',30,'bold')).pack(pady=30)
+        self.l_u=self.create_entry('Username'); self.l_p=self.create_entry('Password',show='*')
+        ttk.Button(self.root,text='Login',command=self.check_user).pack(pady=20)
+        ttk.Button(self.root,text='⬅️ Back',command=self.show_main_menu).pack(pady=10)
+
+    def check_user(self):
+        u,p=self.l_u.get(),self.l_p.get()
+        def logged_in(r): self.current_user=(u,r.email); self.changed(); self.show_user_dashboard()   # login may re-hash an old password
+        self.with_data(lambda: self.run('login', u, p, done=logged_in, io=False))
+
+    def show_user_dashboard(self):
+        self.clear(); tk.Label(self.root,text=f'Welcome {self.current_user[0]}',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',32,'bold')).pack(pady=30)
+        box=tk.Frame(self.root,bg=BG_COLOR); box.pack()
+        def overview(result):
+            if not box.winfo_exists(): return
+            adopted,pending=result
+            if adopted:
+                tk.Label(box,text='Your Adoptions',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',24,'bold')).pack(pady=10)
+                for r in adopted: tk.Label(box,text=f'ID:{r.animal_id} {r.animal_name}',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',20)).pack(pady=5)
+            else:
+                tk.Label(box,text='No adoptions yet',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',20)).pack(pady=10)
+            if pending:
+                tk.Label(box,text='Pending Requests',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',24,'bold')).pack(pady=10)
+                for r in pending: tk.Label(box,text=f'ID:{r.animal_id} {r.animal_name}',bg=BG_COLOR,fg=FG_COLOR,font=('Arial',20)).pack(pady=5)
+        self.run('user_overview',self.current_user[0],done=overview)
+        ttk.Button(self.root,text='Request Adoption',command=self.adopt_dialog).pack(pady=20)
+        ttk.Button(self.root,text='⬅️ Logout',command=self.show_main_menu).pack(pady=10)
+
+    @perf.timed()
+    def adopt_dialog(self):
+    # 1) Clear out any existing widgets on the main window
+        self.clear()
+        self.root.title('Choose Animal')
+        self.root.state('zoomed')
+        self.root.configure(bg=BG_COLOR)
+
+    # 2) Header and back button
+        tk.Label(self.root, text='Choose Animal', bg=BG_COLOR, fg=FG_COLOR,
+             font=('Arial', 28, 'bold')).pack(pady=20)
+        ttk.Button(self.root, text='⬅️ Back', command=self.show_user_dashboard).pack(side='bottom', pady=20)
+
+    # 3) Cards are built on demand by the grid as they scroll into view;
+    #    each page of animals comes with its adoption status for this user
+        user = self.current_user[0]
+        def with_status(animals):
+            return list(zip(animals, self.svc.adoption_states([a.id for a in animals], user)))
+        def render(card, item):
+            a, (state, mine) = item
+            if state == ADOPTED:
+                status = 'Adopted'
+            elif mine:
+                status = 'Pending'
+            else:
+                status = ''
+            # Pass only aid & name to send_request
+            actions = [] if status else [('Request', lambda: self.send_request(a.id, a.name))]
+            card.show(None, [f'{a.name} ({a.species})', f'Age: {a.age}', f'Description: {a.description}'],
+                      actions, status)
+            self.show_photo(card, a.photo, GRID_SIZE)
+
+    # 4) Load data off the Tk thread, then fill the grid
+        grid = self.card_grid(self.root, render, (240, 380))
+        fetch = lambda offset, limit: with_status(self.svc.animals(offset, limit))
+        self.search_bar(self.root, grid, fetch, with_status)
+        self.with_data(lambda: self.page_source(grid, fetch))
+
+
+
+    def send_request(self, aid, name):
+        def sent(_):
+            self.changed()
+            messagebox.showinfo('Requested', f'Request sent for {name}')
+            # Navigate back to the user dashboard
+            self.show_user_dashboard()
+        self.run('request_adoption', aid, *self.current_user, done=sent)
+
+
+
+    # helper to create entries
+    def create_entry(self, placeholder, show=None):
+        ent=ttk.Entry(self.root, show=show if show else '')
+        ent.insert(0, placeholder)
+        ent.pack(pady=5)
+        def on_in(e):
+            if ent.get()==placeholder: ent.delete(0,tk.END)
+        def on_out(e):
+            if not ent.get(): ent.insert(0, placeholder)
+        ent.bind('<FocusIn>',on_in); ent.bind('<FocusOut>',on_out)
+        return ent
+
+if __name__=='__main__':
+    root=tk.Tk(); 
+    app=AnimalRescueHub(root); 
+    root.mainloop()
@@ -0,0 +1,295 @@
+"""Local HTTP/JSON API over RescueService, plus the client the Tk app uses to talk to it.
+
+    python api.py --port 8765 --data animal_data.xlsx
+    RESCUE_API=http://127.0.0.1:8765 python animal_rescue.py
+
+Admin routes (adding, deleting, photos, requests and decisions, adoptions)
+need the token from POST /admin/login as `Authorization: Bearer <token>`.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, urlencode
+from service import RescueService, ServiceError, DecisionReport
+from storage import Animal, User, Adoption, Request, EXCEL_FILE
+import argparse, asyncio, http.client, json, os, re, secrets, select, threading, time
+import perf
+
+# --------------------------------------- CONFIG ---------------------------------------
+HOST = '127.0.0.1'
+PORT = 8765
+API_WORKERS = 8           # storage calls run on at most this many threads
+MAX_BODY = 1024 * 1024
+FLUSH_SECS = 2            # write-back interval for the Excel store
+TOKEN_SECS = 8 * 3600     # lifetime of the tokens /login and /admin/login hand out
+ADMIN, USER = 'admin', 'user'   # route flags: need a token from /admin/login or /login
+
+# --------------------------------------- SERVER ---------------------------------------
+class ApiServer:
+    """asyncio HTTP/1.1 server; each request is one RescueService call on the worker pool.
+
+    Routes flagged ADMIN need the bearer token returned by /admin/login, routes
+    flagged USER the one from /login; those act for the user the token was
+    issued to, whatever username the request names.
+    """
+
+    def __init__(self, svc, workers=API_WORKERS):
+        self.svc = svc
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='rescue-api')
+        self.tokens = {}   # token -> (ADMIN or USER, username, expiry as time.monotonic)
+        self.token_lock = threading.Lock()
+        n = r'(-?\d+)'
+        self.routes = [
+            ('GET', r'/animals', lambda q, b: {'total': svc.animal_count(),
+                                               'items': svc.animals(_count(q, 'offset', 0), _count(q, 'limit'))}),
+            ('GET', r'/animals/search', lambda q, b: svc.search_animals(q.get('q', ''), _num(q, 'min_age'), _num(q, 'max_age'),
+                                                                  q.get('sort', 'id'), q.get('reverse') == '1')),
+            ('GET', rf'/animals/{n}', lambda q, b, aid: svc.get_animal(aid) or _missing()),
+            ('POST', r'/animals', lambda q, b: svc.add_animal(b.get('name'), b.get('species'), b.get('age'), b.get('description')), ADMIN),
+            ('DELETE', rf'/animals/{n}', lambda q, b, aid: svc.delete_animal(aid), ADMIN),
+            ('POST', r'/animals/photos', lambda q, b: svc.photos(b.get('ids', []))),
+            ('POST', r'/animals/states', lambda q, b: svc.adoption_states(b.get('ids', []), q['_user']), USER),
+            ('PUT', rf'/animals/{n}/photo', lambda q, b, aid: svc.set_photo(aid, b.get('path')), ADMIN),
+            ('POST', r'/users', lambda q, b: svc.register(b.get('username'), b.get('password'), b.get('email'))),
+            ('GET', r'/users/overview', lambda q, b: dict(zip(('adoptions', 'requests'), svc.user_overview(q['_user']))), USER),
+            ('POST', r'/login', lambda q, b: self.login(b.get('username'), b.get('password'), q['_ip'])),
+            ('POST', r'/admin/login', lambda q, b: self.admin_login(b.get('username'), b.get('password'), q['_ip'])),
+            ('GET', r'/requests', lambda q, b: svc.requests(), ADMIN),
+            ('GET', r'/requests/count', lambda q, b: svc.pending_count(), ADMIN),
+            ('POST', r'/requests', lambda q, b: svc.request_adoption(b.get('animal_id'), q['_user']), USER),
+            ('POST', r'/requests/decide', lambda q, b: svc.decide(b.get('animal_id'), b.get('username'), bool(b.get('accept'))), ADMIN),
+            ('POST', r'/requests/decide-many', lambda q, b: svc.decide_many([(aid, user, bool(ok)) for aid, user, ok in b.get('decisions', [])])._asdict(), ADMIN),
+            ('GET', r'/adoptions', lambda q, b: svc.adoptions(), ADMIN),
+        ]
+        self.routes = [(r[0], re.compile(r[1] + '$'), r[2], r[3] if len(r) > 3 else None) for r in self.routes]
+
+    def login(self, username, password, ip):
+        u = self.svc.login(username, password, ip)
+        return {'user': u._replace(pw_hash=None), 'token': self.issue(USER, u.username)}
+
+    def admin_login(self, username, password, ip):
+        self.svc.admin_login(username, password, ip)
+        return {'token': self.issue(ADMIN, None)}
+
+    def issue(self, role, username):
+        now = time.monotonic()
+        token = secrets.token_urlsafe(32)
+        with self.token_lock:
+            self.tokens = {t: s for t, s in self.tokens.items() if s[2] > now}
+            self.tokens[token] = (role, username, now + TOKEN_SECS)
+        return token
+
+    def session(self, headers):
+        """(role, username) of the request's bearer token, or (None, None)."""
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        role, username, expiry = self.tokens.get(token, (None, None, 0)) if scheme.lower() == 'bearer' else (None, None, 0)
+        return (role, username) if expiry > time.monotonic() else (None, None)
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        asyncio.get_running_loop().create_task(self.autoflush())
+        print(f'Animal Rescue API on http://{host}:{port}')
+        async with server: await server.serve_forever()
+
+    async def autoflush(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(FLUSH_SECS)
+            try: await loop.run_in_executor(self.pool, self.svc.flush)
+            except Exception as e: print(f'Failed to save: {e}')
+
+    async def handle(self, reader, writer):
+        peer = (writer.get_extra_info('peername') or ('',))[0]
+        try:
+            while True:   # keep-alive: serve requests until the client hangs up
+                line = await reader.readline()
+                if not line: break
+                method, target, _ = line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while (h := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    k, _, v = h.decode('latin-1').partition(':')
+                    headers[k.strip().lower()] = v.strip()
+                size = int(headers.get('content-length', 0))
+                if size > MAX_BODY: await self.respond(writer, 413, {'error': 'Body too large'}); break
+                body = await reader.readexactly(size) if size else b''
+                status, payload = await self.dispatch(method, target, body, peer, headers)
+                await self.respond(writer, status, payload)
+                if headers.get('connection', '').lower() == 'close': break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body, peer='', headers={}):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        query['_ip'] = peer   # for login throttling; set last so a client cannot supply it
+        role, query['_user'] = self.session(headers)   # likewise: who the token was issued to
+        for m, pattern, fn, needs in self.routes:
+            match = pattern.match(url.path)
+            if match and m == method:
+                if needs and role != needs: return 401, {'error': 'Admin login required' if needs == ADMIN else 'Login required'}
+                try:
+                    data = json.loads(body) if body else {}
+                    if not isinstance(data, dict): raise ValueError('body must be a JSON object')
+                    args = [int(g) for g in match.groups()]
+                    def call():
+                        with perf.span(f'api {m} {pattern.pattern[:-1]}'): return fn(query, data, *args)
+                    result = await asyncio.get_running_loop().run_in_executor(self.pool, call)
+                    return 200, {'result': result}
+                except KeyError as e: return 400, {'error': f'Bad request: missing {e}'}
+                except LookupError as e: return 404, {'error': str(e) or 'Not found'}
+                except ServiceError as e: return 400, {'error': str(e)}
+                except (ValueError, TypeError) as e: return 400, {'error': f'Bad request: {e}'}
+                except Exception as e:   # storage errors and bugs: answer anyway, or the client sees a dropped connection
+                    print(f'{method} {url.path} failed: {e!r}')
+                    return 500, {'error': f'Server error: {e}'}
+        return 404, {'error': 'Not found'}
+
+    async def respond(self, writer, status, payload):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(f'HTTP/1.1 {status} {http.client.responses.get(status, "")}\r\n'
+                     f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+
+def _count(q, key, default=None):
+    if key not in q: return default
+    n = int(q[key])
+    if n < 0: raise ValueError(f'{key} must not be negative')
+    return n
+
+
+def _num(q, key):
+    return float(q[key]) if q.get(key) else None
+
+
+def _missing():
+    raise LookupError('ID not found')
+
+# --------------------------------------- CLIENT ---------------------------------------
+class ApiClient:
+    """Drop-in for RescueService that forwards every call to an ApiServer."""
+
+    def __init__(self, url):
+        u = urlsplit(url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.local = threading.local()   # one keep-alive connection per thread
+        self.token = None                # from login/admin_login, sent with every request
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None and conn.sock is not None and select.select([conn.sock], [], [], 0)[0]:
+            conn.close(); conn = None   # an idle keep-alive socket only becomes readable once the server hung up
+        if conn is None: conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        return conn
+
+    def call(self, method, path, body=None):
+        # only GETs are sent again: a write that may have reached the server must not run twice
+        for attempt in (0, 1):
+            conn = self.connection()
+            try:
+                headers = {'Content-Type': 'application/json'}
+                if self.token: headers['Authorization'] = f'Bearer {self.token}'
+                conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+                resp = conn.getresponse()
+                data = json.loads(resp.read() or b'{}')
+                break
+            except (ConnectionError, http.client.HTTPException):
+                conn.close(); self.local.conn = None
+                if attempt or method != 'GET': raise
+        if resp.status == 404 and path.startswith('/animals/') and method == 'GET': return None
+        if resp.status >= 400: raise ServiceError(data.get('error', f'HTTP {resp.status}'))
+        return data.get('result')
+
+    # local-only operations have nothing to do against a server
+    def refresh(self): return False
+
+    def flush(self): return False
+
+    def checkpoint(self): return False
+
+    def register(self, username, password, email):
+        self.call('POST', '/users', {'username': username, 'password': password, 'email': email})
+
+    def login(self, username, password, ip=None):   # the server sees the address itself
+        r = self.call('POST', '/login', {'username': username, 'password': password})
+        self.token = r['token']
+        return User(*r['user'])
+
+    def admin_login(self, username, password, ip=None):
+        self.token = self.call('POST', '/admin/login', {'username': username, 'password': password})['token']
+
+    def animals(self, offset=0, limit=None):
+        q = f'/animals?offset={offset}' + (f'&limit={limit}' if limit is not None else '')
+        return [Animal(*a) for a in self.call('GET', q)['items']]
+
+    def animal_count(self):
+        return self.call('GET', '/animals?limit=0')['total']
+
+    def search_animals(self, text='', min_age=None, max_age=None, sort='id', reverse=False):
+        q = {'q': text, 'sort': sort, 'reverse': int(bool(reverse))}
+        q.update((k, v) for k, v in (('min_age', min_age), ('max_age', max_age)) if v is not None)
+        return [Animal(*a) for a in self.call('GET', '/animals/search?' + urlencode(q))]
+
+    def get_animal(self, aid):
+        a = self.call('GET', f'/animals/{aid}')
+        return Animal(*a) if a else None
+
+    def photos(self, aids):
+        return {int(aid): path for aid, path in self.call('POST', '/animals/photos', {'ids': list(aids)}).items()}
+
+    def add_animal(self, name, species, age, description):
+        return Animal(*self.call('POST', '/animals', {'name': name, 'species': species, 'age': age, 'description': description}))
+
+    def delete_animal(self, aid):
+        self.call('DELETE', f'/animals/{aid}')
+
+    def set_photo(self, aid, path):
+        self.call('PUT', f'/animals/{aid}/photo', {'path': path})
+
+    def import_animals(self, path, progress=None):
+        raise ServiceError('Import runs on the server: python bulk.py import FILE')
+
+    def export_excel(self, path):
+        raise ServiceError('Export runs on the server: python bulk.py export FILE')
+
+    def requests(self):
+        return [Request(*r) for r in self.call('GET', '/requests')]
+
+    def pending_count(self):
+        return self.call('GET', '/requests/count')
+
+    def adoptions(self):
+        return [Adoption(*r) for r in self.call('GET', '/adoptions')]
+
+    # the user ones act for whoever logged in on this client; `username` is only
+    # there to match RescueService
+    def user_overview(self, username):
+        r = self.call('GET', '/users/overview')
+        return [Adoption(*a) for a in r['adoptions']], [Request(*q) for q in r['requests']]
+
+    def adoption_states(self, aids, username=None):
+        return [tuple(s) for s in self.call('POST', '/animals/states', {'ids': list(aids)})]
+
+    def request_adoption(self, aid, username, email=None):
+        return Animal(*self.call('POST', '/requests', {'animal_id': aid}))
+
+    def decide(self, aid, username, accept):
+        return Request(*self.call('POST', '/requests/decide', {'animal_id': aid, 'username': username, 'accept': accept}))
+
+    def decide_many(self, decisions):
+        r = self.call('POST', '/requests/decide-many', {'decisions': [list(d) for d in decisions]})
+        return DecisionReport(*([Request(*q) for q in r[k]] for k in ('accepted', 'rejected', 'auto_rejected')),
+                              [(tuple(key), reason) for key, reason in r['skipped']])
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--host', default=HOST)
+    ap.add_argument('--port', type=int, default=PORT)
+    ap.add_argument('--data', default=os.environ.get('RESCUE_DATA', EXCEL_FILE), help='data file (.xlsx or .db)')
+    ap.add_argument('--workers', type=int, default=API_WORKERS)
+    args = ap.parse_args()
+    svc = RescueService.open(args.data)
+    try: asyncio.run(ApiServer(svc, args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt: pass
+    finally: svc.checkpoint()
@@ -0,0 +1,94 @@
+"""Password hashing and login throttling.
+
+Hashes are stored as 'scrypt$n$r$p$salt$hash' (hex), or 'pbkdf2$iterations$salt$hash'
+where hashlib has no scrypt. Bare 64-hex values are the old unsalted SHA-256
+hashes; they still verify and are reported as needing an upgrade.
+"""
+from collections import defaultdict, deque
+from functools import lru_cache
+import hashlib, hmac, os, threading, time
+
+# --------------------------------------- CONFIG ---------------------------------------
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1   # ~16 MB and a few tens of ms per hash
+PBKDF2_ITERATIONS = 600_000
+SALT_BYTES = 16
+MAX_FAILURES = 5        # failed logins per user or per address ...
+FAIL_WINDOW = 300       # ... within this many seconds ...
+LOCKOUT = 60            # ... lock that key out for this long
+PRUNE_AT = 10_000       # tracked keys before stale ones are dropped
+
+# ----------------------------------- UTIL FUNCTIONS ----------------------------------
+def legacy_hash(pw):
+    return hashlib.sha256(pw.encode()).hexdigest()
+
+
+def hash_password(pw, salt=None):
+    salt = salt or os.urandom(SALT_BYTES)
+    if hasattr(hashlib, 'scrypt'):
+        h = hashlib.scrypt(pw.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, maxmem=64 * 1024 * 1024)
+        return f'scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${h.hex()}'
+    h = hashlib.pbkdf2_hmac('sha256', pw.encode(), salt, PBKDF2_ITERATIONS)
+    return f'pbkdf2${PBKDF2_ITERATIONS}${salt.hex()}${h.hex()}'
+
+
+def verify_password(stored, pw):
+    """(matches, needs_rehash) for a stored hash of any supported format."""
+    stored = str(stored or '')
+    scheme, _, rest = stored.partition('$')
+    try:
+        if scheme == 'scrypt':
+            n, r, p, salt, h = rest.split('$')
+            n, r, p = int(n), int(r), int(p)
+            got = hashlib.scrypt(pw.encode(), salt=bytes.fromhex(salt), n=n, r=r, p=p, maxmem=64 * 1024 * 1024)
+            return hmac.compare_digest(got.hex(), h), (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        if scheme == 'pbkdf2':
+            iterations, salt, h = rest.split('$')
+            got = hashlib.pbkdf2_hmac('sha256', pw.encode(), bytes.fromhex(salt), int(iterations))
+            return hmac.compare_digest(got.hex(), h), hasattr(hashlib, 'scrypt') or int(iterations) < PBKDF2_ITERATIONS
+    except ValueError:
+        return False, False
+    return hmac.compare_digest(stored, legacy_hash(pw)), True
+
+
+@lru_cache(maxsize=1)
+def dummy_hash():
+    # verified against when the username does not exist, so unknown and known
+    # users take the same time to refuse; made on first use, not at import
+    return hash_password('', b'\0' * SALT_BYTES)
+
+# ------------------------------------- THROTTLE -------------------------------------
+class Throttle:
+    """Counts failed logins per key (('user', name), ('ip', address)) and locks
+    a key out for LOCKOUT seconds after MAX_FAILURES within FAIL_WINDOW."""
+
+    def __init__(self, max_failures=MAX_FAILURES, window=FAIL_WINDOW, lockout=LOCKOUT, clock=time.monotonic):
+        self.max_failures, self.window, self.lockout, self.clock = max_failures, window, lockout, clock
+        self.lock = threading.Lock()
+        self.failures = defaultdict(deque)   # key -> failure times within the window
+        self.locked = {}                     # key -> locked until
+
+    def wait(self, *keys):
+        """Seconds until every key may try again (0 if none is locked out)."""
+        now = self.clock()
+        with self.lock:
+            return max([self.locked[k] - now for k in keys if self.locked.get(k, 0) > now] or [0])
+
+    def failed(self, *keys):
+        now = self.clock()
+        with self.lock:
+            for k in keys:
+                times = self.failures[k]
+                times.append(now)
+                while times and times[0] <= now - self.window: times.popleft()
+                if len(times) >= self.max_failures:
+                    self.locked[k] = now + self.lockout
+                    del self.failures[k]
+            if len(self.failures) + len(self.locked) > PRUNE_AT: self._prune(now)
+
+    def _prune(self, now):
+        for k in [k for k, times in self.failures.items() if times[-1] <= now - self.window]: del self.failures[k]
+        for k in [k for k, until in self.locked.items() if until <= now]: del self.locked[k]
+
+    def succeeded(self, *keys):
+        with self.lock:
+            for k in keys: self.failures.pop(k, None); self.locked.pop(k, None)
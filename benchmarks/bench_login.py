@@ -0,0 +1,72 @@
+"""Login latency against a large user table.
+
+    python benchmarks/bench_login.py --users 100000 --backend xlsx
+
+Every user shares one pre-computed password hash (hashing 100k passwords
+would take longer than the benchmark); a few users keep the old SHA-256
+hash to time the upgrade path.
+"""
+import os, random, statistics, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from auth import Throttle, hash_password, legacy_hash
+from service import RescueService, ServiceError
+from storage import SqliteStore, ExcelStore, export_excel
+import argparse
+
+PASSWORD = 'correct horse'
+
+
+def build(path, users, legacy):
+    """A data file with `users` users; the first `legacy` have SHA-256 hashes."""
+    db = SqliteStore(path if path.endswith('.db') else path + '.db')
+    new, old = hash_password(PASSWORD), legacy_hash(PASSWORD)
+    with db.lock, db.db:
+        db.db.executemany('INSERT INTO users VALUES (?,?,?)',
+                          ((f'user{i}', old if i < legacy else new, f'user{i}@example.org') for i in range(users)))
+    if path.endswith('.db'): return
+    export_excel(db, path)
+    db.db.close(); os.remove(path + '.db')
+
+
+def timed(fn, *args):
+    t = time.perf_counter()
+    try: fn(*args)
+    except ServiceError: pass
+    return (time.perf_counter() - t) * 1000
+
+
+def report(name, ms):
+    q = statistics.quantiles(ms, n=20) if len(ms) > 1 else ms * 19
+    print(f'{name:<28} n={len(ms):<5} p50={statistics.median(ms):8.2f} ms  p95={q[18]:8.2f} ms  max={max(ms):8.2f} ms')
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--users', type=int, default=100_000)
+    ap.add_argument('--backend', choices=('xlsx', 'db'), default='xlsx')
+    ap.add_argument('--samples', type=int, default=50)
+    args = ap.parse_args()
+    n, legacy = args.users, min(args.samples, args.users)
+    rnd = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.' + args.backend)
+        t = time.perf_counter(); build(path, n, legacy)
+        print(f'built {n} users in {time.perf_counter() - t:.1f}s ({os.path.getsize(path) / 1e6:.1f} MB {args.backend})')
+        t = time.perf_counter()
+        store = ExcelStore(path) if args.backend == 'xlsx' else SqliteStore(path)
+        svc = RescueService(store)
+        svc.throttle = Throttle(max_failures=10 ** 9)   # measure hashing, not lockouts
+        print(f'opened store in {time.perf_counter() - t:.2f}s')
+
+        pick = lambda: f'user{rnd.randrange(legacy, n)}' if n > legacy else 'user0'
+        report('username lookup', [timed(store.get_user, pick()) for _ in range(args.samples * 20)])
+        report('linear scan (old lookup)', [timed(lambda u: next(r for r in store.rows('Users') if r[0] == u), pick())
+                                            for _ in range(min(args.samples, 20))])
+        report('login ok', [timed(svc.login, pick(), PASSWORD) for _ in range(args.samples)])
+        report('login wrong password', [timed(svc.login, pick(), 'nope') for _ in range(args.samples)])
+        report('login unknown user', [timed(svc.login, f'ghost{i}', PASSWORD) for i in range(args.samples)])
+        report('login + SHA-256 upgrade', [timed(svc.login, f'user{i}', PASSWORD) for i in range(legacy)])
+        report('login after upgrade', [timed(svc.login, f'user{i}', PASSWORD) for i in range(legacy)])
+        t = time.perf_counter(); svc.flush()
+        print(f'saved upgraded hashes in {time.perf_counter() - t:.2f}s')
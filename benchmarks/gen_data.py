@@ -0,0 +1,81 @@
+"""Synthetic animal_data.xlsx files (and photos) of any size, for benchmarks.
+
+    python benchmarks/gen_data.py --animals 10000 --users 5000 --requests 100000 out/animal_data.xlsx
+"""
+import os, random, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openpyxl import Workbook
+from PIL import Image
+from auth import hash_password
+from storage import SHEETS, NEXT_ID, atomic_save
+import argparse
+
+# --------------------------------------- CONFIG ---------------------------------------
+PASSWORD = 'password'      # every generated user's password
+PHOTO_SIZE = (1600, 1200)  # about what a phone camera hands over after resizing
+SPECIES = ['Dog', 'Cat', 'Rabbit', 'Parrot', 'Hamster', 'Turtle', 'Horse', 'Goat']
+SYLLABLES = ['ba', 'lu', 'mi', 'ko', 'ra', 'zu', 'pe', 'to', 'shi', 'na', 'do', 'fi']
+WORDS = ('friendly calm playful shy loves walks kids other pets house trained vaccinated '
+         'needs garden quiet home senior young energetic cuddly rescued from street').split()
+
+# ----------------------------------- UTIL FUNCTIONS ----------------------------------
+def make_photos(photo_dir, count, size=PHOTO_SIZE, seed=0):
+    """`count` distinct JPEGs (noise over a colour gradient); reused if already there."""
+    os.makedirs(photo_dir, exist_ok=True)
+    rnd, paths = random.Random(seed), []
+    for i in range(count):
+        path = os.path.abspath(os.path.join(photo_dir, f'photo_{i:04d}_{size[0]}x{size[1]}.jpg'))
+        if not os.path.exists(path):
+            bands = [Image.linear_gradient('L').resize(size).rotate(rnd.randrange(360)),
+                     Image.effect_noise(size, rnd.randrange(20, 80)),
+                     Image.new('L', size, rnd.randrange(256))]
+            rnd.shuffle(bands)
+            Image.merge('RGB', bands).save(path, 'JPEG', quality=90)
+        paths.append(path)
+    return paths
+
+
+def generate(path, animals=1000, users=500, requests=2000, adoptions=200, photos=20, photo_dir=None, seed=0):
+    """Write a workbook with the app's sheets filled with random but valid rows."""
+    rnd = random.Random(seed)
+    photo_paths = make_photos(photo_dir or os.path.join(os.path.dirname(os.path.abspath(path)), 'photos'), photos, seed=seed)
+    pw_hash = hash_password(PASSWORD)   # one hash for everybody: hashing each would dominate generation
+    names = [''.join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3))).title() for _ in range(animals)]
+    usernames = [f'user{i}' for i in range(users)]
+
+    wb = Workbook(write_only=True)
+    sheets = {name: wb.create_sheet(name) for name in SHEETS}
+    for name, (_, header) in SHEETS.items(): sheets[name].append(header)
+    for i in range(animals):
+        sheets['Animals'].append([i + 1, names[i], rnd.choice(SPECIES), rnd.randint(0, 15),
+                                  ' '.join(rnd.sample(WORDS, 6)).capitalize(),
+                                  rnd.choice(photo_paths) if photo_paths and rnd.random() < 0.9 else None])
+    for u in usernames:
+        sheets['Users'].append([u, pw_hash, f'{u}@example.org'])
+    adopted = rnd.sample(range(1, animals + 1), min(adoptions, animals)) if users else []
+    for aid in adopted:
+        u = rnd.choice(usernames)
+        sheets['Adoptions'].append([aid, names[aid - 1], u, f'{u}@example.org'])
+    pairs = set()
+    while len(pairs) < min(requests, animals * users):
+        pairs.add((rnd.randint(1, animals), rnd.randrange(users)))
+    for aid, ui in pairs:
+        sheets['AdoptionRequests'].append([aid, names[aid - 1], usernames[ui], f'{usernames[ui]}@example.org'])
+    sheets['Meta'].append([NEXT_ID, animals + 1])
+    atomic_save(wb, path)
+    return path
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('target')
+    ap.add_argument('--animals', type=int, default=1000)
+    ap.add_argument('--users', type=int, default=500)
+    ap.add_argument('--requests', type=int, default=2000)
+    ap.add_argument('--adoptions', type=int, default=200)
+    ap.add_argument('--photos', type=int, default=20, help='distinct photos shared by the animals')
+    ap.add_argument('--photo-dir')
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+    generate(args.target, args.animals, args.users, args.requests, args.adoptions, args.photos, args.photo_dir, args.seed)
+    print(f'wrote {args.target} ({os.path.getsize(args.target) / 1e6:.1f} MB)')
@@ -0,0 +1,353 @@
+"""Benchmarks for the AnimalRescueHub data paths, against generated data.
+
+    python benchmarks/run.py --animals 10000 --requests 100000 --save base.json
+    python benchmarks/run.py --animals 10000 --requests 100000 --compare base.json
+
+Each benchmark runs in its own process on a fresh copy of the data file and
+reports wall time per call (first / median / min), the process's peak RSS
+(plus the summed peaks of any worker processes it starts) and the data file
+size afterwards. Setup (opening the store, creating the Tk root) is not
+timed. --compare exits 1 when a median is more than --tolerance slower than
+the saved baseline. The tk_* benchmarks need a display (e.g. xvfb-run)
+and are skipped without one.
+"""
+import json, multiprocessing, os, shutil, statistics, subprocess, sys, tempfile, threading, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+try: import resource
+except ImportError: resource = None   # Windows: no peak RSS
+
+# --------------------------------------- CONFIG ---------------------------------------
+WORKDIR = os.path.join(tempfile.gettempdir(), 'rescue-bench')   # generated data is kept here between runs
+TOLERANCE = 0.25
+SAMPLE_SECS = 0.01   # how often subprocesses of a benchmark (process pools) are checked for their peak RSS
+IMAGE_SIZE = (200, 200)
+BENCH_USERS = 100   # users send_request files requests for
+BENCHES = {}
+
+
+class Skip(Exception):
+    """Raised by a benchmark's setup when it cannot run here."""
+
+
+def bench(fn):
+    BENCHES[fn.__name__] = fn
+    return fn
+
+
+def hwm(pid='self'):
+    """Peak RSS of a process in bytes from /proc (Linux; reset by exec), or None."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'): return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss():
+    rss = hwm()
+    if rss is not None or resource is None: return rss
+    # ru_maxrss also counts whatever the runner had mapped when it started this process
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024   # bytes on macOS, KiB elsewhere
+
+
+class ChildPeaks(threading.Thread):
+    """Samples the peak RSS of this process's multiprocessing children (process pools) until stopped."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peaks, self.stopped = {}, threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(SAMPLE_SECS):
+            for p in multiprocessing.active_children():
+                rss = hwm(p.pid)
+                if rss: self.peaks[p.pid] = max(rss, self.peaks.get(p.pid, 0))
+
+    def stop(self):
+        self.stopped.set(); self.join()
+        return sum(self.peaks.values())
+
+# ------------------------------------- BENCHMARKS -------------------------------------
+# Each takes the data file and returns run(i), the call that is timed; setup happens before.
+def service(data):
+    from service import RescueService
+    return RescueService.open(data)
+
+
+@bench
+def ensure_excel(data):
+    from storage import ensure_excel
+    return lambda i: ensure_excel(f'new{i}.xlsx')
+
+
+@bench
+def open_store(data):
+    return lambda i: service(data)
+
+
+@bench
+def reload_store(data):
+    svc = service(data)   # another desk saved: the whole workbook is parsed again
+    return lambda i: svc.store.load()
+
+
+@bench
+def view_animals(data):
+    from grid import PAGE_SIZE
+    svc = service(data)
+    return lambda i: (svc.refresh(), svc.animal_count(), svc.animals(0, PAGE_SIZE))
+
+
+@bench
+def search_animals(data):
+    svc = service(data)   # the first call builds the index
+    return lambda i: svc.search_animals('ba', 2, 8, 'name')
+
+
+@bench
+def adopt_dialog(data):
+    from grid import PAGE_SIZE
+    svc = service(data)   # the first call builds the status index
+    def run(i):
+        svc.refresh()
+        svc.animal_count()
+        page = svc.animals(0, PAGE_SIZE)
+        svc.adoption_states([a.id for a in page], 'user0')
+    return run
+
+
+@bench
+def view_adoption_requests(data):
+    svc = service(data)
+    return lambda i: (svc.refresh(), svc.requests())
+
+
+def photos(data):
+    found = sorted({a.photo for a in service(data).animals() if a.photo})
+    if not found: raise Skip('no photos in the data file')
+    return found
+
+
+@bench
+def load_image_cold(data):
+    from thumbs import ThumbnailCache
+    paths = photos(data)
+    return lambda i: ThumbnailCache(f'thumbs{i}').decode(paths[i % len(paths)], IMAGE_SIZE)
+
+
+@bench
+def load_image_warm(data):
+    from thumbs import ThumbnailCache
+    paths, cache = photos(data), ThumbnailCache('thumbs')
+    for p in paths: cache.decode(p, IMAGE_SIZE)
+    return lambda i: cache.decode(paths[i % len(paths)], IMAGE_SIZE)
+
+
+@bench
+def precompute_thumbs(data):
+    from thumbs import ThumbnailCache
+    paths = photos(data)   # every size of every photo, cold cache, one process per core
+    return lambda i: ThumbnailCache(f'precomputed{i}').precompute(paths)
+
+
+@bench
+def check_user(data):
+    from gen_data import PASSWORD
+    svc = service(data)
+    if not svc.store.get_user('user0'): raise Skip('no users in the data file')
+    return lambda i: svc.login('user0', PASSWORD)
+
+
+@bench
+def send_request(data):
+    from status import ADOPTED
+    svc = service(data)
+    page = [a.id for a in svc.animals(0, 1000)]
+    aids = [aid for aid, (state, _) in zip(page, svc.adoption_states(page)) if state != ADOPTED]
+    users = [f'bench{i}' for i in range(BENCH_USERS)]   # requests need registered users
+    for u in users: svc.store.add_user(u, '', f'{u}@example.org')
+    def run(i):   # request + the save that follows it
+        svc.request_adoption(aids[i % len(aids)], users[i % len(users)])
+        svc.flush()
+    return run
+
+
+@bench
+def checkpoint(data):
+    svc = service(data)
+    def run(i):   # one small write, then fold the journal into the workbook
+        svc.store.add_user(f'bench{i}', '', f'bench{i}@example.org')
+        svc.flush()
+        svc.checkpoint()
+    return run
+
+
+@bench
+def process_request(data):
+    svc = service(data)
+    pending = svc.requests()
+    if not pending: raise Skip('no requests in the data file')
+    def run(i):   # decision + the save that follows it
+        q = pending[i % len(pending)]
+        svc.decide(q.animal_id, q.username, i % 2 == 0)
+        svc.flush()
+    return run
+
+# ----------------------------------- TK BENCHMARKS -----------------------------------
+def tk_app(data):
+    os.environ['RESCUE_DATA'] = data   # read when animal_rescue is imported
+    import tkinter as tk
+    try: root = tk.Tk()
+    except tk.TclError as e: raise Skip(f'no display ({e})')
+    from animal_rescue import AnimalRescueHub
+    return root, AnimalRescueHub(root)
+
+
+def settle(app):
+    # wait for the view's queued data loads and their hand-back to the Tk thread, including
+    # the loads those queue in turn (grid pages); results include up to tasks.POLL_MS of polling delay
+    while True:
+        app.tasks.io.submit(lambda: None).result()
+        if app.tasks.finished.empty(): break
+        while not app.tasks.finished.empty():
+            app.root.update()
+            time.sleep(0.001)
+        app.root.update()
+
+
+@bench
+def tk_startup(data):
+    os.environ['RESCUE_DATA'] = data
+    import tkinter as tk
+    try: tk.Tk().destroy()
+    except tk.TclError as e: raise Skip(f'no display ({e})')
+    from animal_rescue import AnimalRescueHub
+    apps = []
+    def run(i):
+        if apps: app = apps.pop(); app.tasks.shutdown(); app.root.destroy()
+        root = tk.Tk()
+        apps.append(AnimalRescueHub(root))
+        root.update()
+    return run
+
+
+@bench
+def tk_view_animals(data):
+    import tkinter as tk
+    root, app = tk_app(data)
+    def run(i):
+        for w in root.winfo_children():
+            if isinstance(w, tk.Toplevel): w.destroy()
+        app.view_animals()
+        settle(app)
+    return run
+
+
+@bench
+def tk_adopt_dialog(data):
+    root, app = tk_app(data)
+    app.current_user = ('user0', 'user0@example.org')
+    def run(i):
+        app.adopt_dialog()
+        settle(app)
+    return run
+
+
+@bench
+def tk_view_adoption_requests(data):
+    import tkinter as tk
+    root, app = tk_app(data)
+    def run(i):
+        for w in root.winfo_children():
+            if isinstance(w, tk.Toplevel): w.destroy()
+        app.view_adoption_requests()
+        settle(app)
+    return run
+
+# --------------------------------------- RUNNER ---------------------------------------
+def child(name, data, repeat):
+    """Run one benchmark in this process and print its result as JSON."""
+    tmp = tempfile.mkdtemp(prefix='rescue-bench-')
+    try:
+        copy = shutil.copy(data, tmp)
+        os.chdir(tmp)   # thumbnails, lock files and new workbooks stay in here
+        try: run = BENCHES[name](copy)
+        except Skip as e: return print(json.dumps({'name': name, 'skipped': str(e)}))
+        times, children = [], ChildPeaks()
+        children.start()
+        for i in range(repeat):
+            t = time.perf_counter()
+            run(i)
+            times.append((time.perf_counter() - t) * 1000)
+        print(json.dumps({'name': name, 'times': times, 'rss': peak_rss(), 'child_rss': children.stop(),
+                          'size': os.path.getsize(copy)}))
+    finally:
+        os.chdir(os.path.dirname(tmp))
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def dataset(args):
+    from gen_data import generate
+    d = os.path.join(args.workdir, f'a{args.animals}-u{args.users}-r{args.requests}-d{args.adoptions}-p{args.photos}')
+    path = os.path.join(d, 'animal_data.xlsx')
+    if not os.path.exists(path):
+        os.makedirs(d, exist_ok=True)
+        t = time.perf_counter()
+        generate(path, args.animals, args.users, args.requests, args.adoptions, args.photos, os.path.join(d, 'photos'))
+        print(f'generated {path} in {time.perf_counter() - t:.1f}s')
+    return path
+
+
+def report(r, base):
+    if 'skipped' in r: return print(f"{r['name']:<26} skipped: {r['skipped']}")
+    t = r['times']
+    line = (f"{r['name']:<26} first={t[0]:9.2f}  median={r['median']:9.2f}  min={min(t):9.2f} ms"
+            f"  rss={(r['rss'] or 0) / 2 ** 20:7.1f} MB  file={r['size'] / 2 ** 20:6.2f} MB")
+    if r.get('child_rss'): line += f"  (+{r['child_rss'] / 2 ** 20:.1f} MB in subprocesses)"
+    if base and 'median' in base: line += f"  ({r['median'] / base['median'] - 1:+.0%} vs baseline)"
+    print(line)
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--animals', type=int, default=10_000)
+    ap.add_argument('--users', type=int, default=2_000)
+    ap.add_argument('--requests', type=int, default=100_000)
+    ap.add_argument('--adoptions', type=int, default=1_000)
+    ap.add_argument('--photos', type=int, default=50)
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--only', nargs='*', choices=sorted(BENCHES), help='run just these benchmarks')
+    ap.add_argument('--workdir', default=WORKDIR)
+    ap.add_argument('--save', help='write the results to this JSON file')
+    ap.add_argument('--compare', help='baseline JSON from an earlier --save')
+    ap.add_argument('--tolerance', type=float, default=TOLERANCE)
+    ap.add_argument('--child', help=argparse.SUPPRESS)
+    ap.add_argument('--data', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child: child(args.child, args.data, args.repeat); sys.exit()
+
+    data = dataset(args)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f: baseline = {r['name']: r for r in json.load(f)['results']}
+    results, slower = [], []
+    for name in args.only or BENCHES:
+        p = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name, '--data', data,
+                            '--repeat', str(args.repeat)], capture_output=True, text=True)
+        if p.returncode:
+            print(f'{name:<26} failed:\n{p.stderr}'); slower.append(name); continue
+        r = json.loads(p.stdout.strip().splitlines()[-1])
+        if 'times' in r: r['median'] = statistics.median(r['times'])
+        report(r, baseline.get(name))
+        results.append(r)
+        b = baseline.get(name, {})
+        if 'median' in r and 'median' in b and r['median'] > b['median'] * (1 + args.tolerance): slower.append(name)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'params': {k: getattr(args, k) for k in ('animals', 'users', 'requests', 'adoptions', 'photos', 'repeat')},
+                       'results': results}, f, indent=1)
+    if slower:
+        print('regressed or failed: ' + ', '.join(slower)); sys.exit(1)
@@ -0,0 +1,59 @@
+"""Startup report: what importing the app costs, module by module (python -X importtime).
+
+    python benchmarks/startup.py              # slowest imports + any heavy module loaded eagerly
+    python benchmarks/startup.py --log perf.jsonl
+                                              # ...plus menu/data/warm milestones of the last
+                                              #    `RESCUE_PERF=1 python animal_rescue.py` run
+
+Exits 1 if a module from HEAVY is imported at startup, so it can guard CI.
+"""
+import json, os, subprocess, sys
+import argparse
+
+# --------------------------------------- CONFIG ---------------------------------------
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('openpyxl', 'PIL', 'asyncio')   # loaded on first use, never at startup
+MILESTONES = ('startup_menu', 'startup_data', 'startup_warm')
+
+
+def import_times(module):
+    """[(cumulative µs, self µs, depth, name)] from `python -X importtime -c 'import module'`."""
+    p = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                       cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in p.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        own, cum, name = line[len('import time:'):].split('|')
+        rows.append((int(cum), int(own), (len(name) - len(name.lstrip())) // 2, name.strip()))
+    return rows
+
+
+def milestones(log):
+    last = {}
+    with open(log, encoding='utf-8') as f:
+        for line in f:
+            try: e = json.loads(line)
+            except ValueError: continue
+            if e.get('op') in MILESTONES: last[e['op']] = e['ms']
+    return last
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--module', default='animal_rescue')
+    ap.add_argument('--top', type=int, default=15)
+    ap.add_argument('--log', help='perf.jsonl written by a RESCUE_PERF=1 run of the app')
+    args = ap.parse_args()
+
+    rows = import_times(args.module)
+    total = next((cum for cum, _, depth, name in rows if name == args.module), 0)
+    print(f'import {args.module}: {total / 1000:.1f} ms, {len(rows)} modules')
+    print(f'{"cumulative ms":>14} {"self ms":>9}  module')
+    for cum, own, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f'{cum / 1000:14.1f} {own / 1000:9.1f}  {"  " * depth}{name}')
+    eager = sorted({name.split('.')[0] for _, _, _, name in rows if name.split('.')[0] in HEAVY})
+    if args.log:
+        for op, ms in milestones(args.log).items(): print(f'{op:<14} {ms:9.1f} ms after start')
+    if eager:
+        print('imported at startup but should load lazily: ' + ', '.join(eager))
+        sys.exit(1)
@@ -0,0 +1,94 @@
+"""Bulk animal import from CSV/XLSX and streaming export of all sheets.
+
+    python bulk.py import partner_animals.csv
+    python bulk.py export backup.xlsx
+"""
+from collections import namedtuple
+from storage import open_store, export_excel, EXCEL_FILE
+import argparse, csv, os
+
+# --------------------------------------- CONFIG ---------------------------------------
+FIELDS = ['Name','Species','Age','Description','Photo']
+REQUIRED = ['Name','Species','Age','Description']
+PROGRESS_EVERY = 500   # rows between progress callbacks
+
+ImportReport = namedtuple('ImportReport', 'added rejected')   # rejected: [(line, row dict, reason)]
+
+# ----------------------------------- UTIL FUNCTIONS ----------------------------------
+def read_source(path):
+    """Yield (line number, {column: value}) from a CSV or XLSX file, streaming."""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for n, rec in enumerate(csv.DictReader(f), start=2):
+                yield n, rec
+        return
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True)
+    try:
+        ws = wb['Animals'] if 'Animals' in wb.sheetnames else wb.active   # our own exports included
+        rows = ws.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+        for n, row in enumerate(rows, start=2):
+            if all(v is None for v in row): continue
+            yield n, dict(zip(header, row))
+    finally:
+        wb.close()
+
+
+def validate(rec, base_dir='.'):
+    """(name, species, age, description, photo) for a source row, or ValueError."""
+    rec = {str(k).strip().title(): ('' if v is None else str(v).strip()) for k, v in rec.items() if k}
+    missing = [f for f in REQUIRED if not rec.get(f)]
+    if missing: raise ValueError('missing ' + ', '.join(missing))
+    try: age = float(rec['Age'])
+    except ValueError: raise ValueError(f"age is not a number: {rec['Age']!r}")
+    if age < 0: raise ValueError(f"negative age: {rec['Age']}")
+    photo = rec.get('Photo', '')
+    if photo:
+        photo = os.path.join(base_dir, photo) if not os.path.isabs(photo) else photo
+        if not os.path.exists(photo): raise ValueError(f'photo not found: {photo}')
+    return rec['Name'], rec['Species'], rec['Age'], rec['Description'], photo
+
+# ---------------------------------- IMPORT / EXPORT ----------------------------------
+def import_animals(store, path, progress=None):
+    """Validate every row of `path`, add the good ones in one batch and save once."""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    records, rejected, n = [], [], 0
+    for n, rec in read_source(path):
+        try: records.append(validate(rec, base_dir))
+        except ValueError as e: rejected.append((n, rec, str(e)))
+        if progress and n % PROGRESS_EVERY == 0: progress(n)
+    added = store.add_animals(records)
+    store.flush()
+    if progress: progress(n)
+    return ImportReport(added, rejected)
+
+
+def write_rejects(report, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(['Line', 'Reason'] + FIELDS)
+        for n, rec, reason in report.rejected:
+            w.writerow([n, reason] + [rec.get(k, rec.get(k.lower(), '')) for k in FIELDS])
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--data', default=os.environ.get('RESCUE_DATA', EXCEL_FILE), help='data file (.xlsx or .db)')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    imp = sub.add_parser('import', help='add animals from a CSV/XLSX file')
+    imp.add_argument('source')
+    imp.add_argument('--rejects', help='write rejected rows to this CSV')
+    exp = sub.add_parser('export', help='export every sheet to an xlsx file')
+    exp.add_argument('target')
+    args = ap.parse_args()
+
+    store = open_store(args.data)
+    if args.cmd == 'import':
+        report = import_animals(store, args.source, progress=lambda n: print(f'read {n} rows', end='\r'))
+        print(f'\nadded {len(report.added)} animals, rejected {len(report.rejected)} rows')
+        for n, _, reason in report.rejected[:20]: print(f'  line {n}: {reason}')
+        if args.rejects: write_rejects(report, args.rejects)
+        store.checkpoint()
+    else:
+        export_excel(store, args.target)
@@ -0,0 +1,213 @@
+import tkinter as tk
+from tkinter import ttk
+import perf
+
+# --------------------------------------- CONFIG ---------------------------------------
+BUFFER_ROWS = 2    # rows of cards kept alive above and below the viewport
+PAGE_SIZE = 120    # rows fetched from the data source at a time
+CARD_PAD = 10
+
+# --------------------------------------- CARD ---------------------------------------
+class Card(tk.Frame):
+    """A fixed-size card whose image, text lines and buttons can be refilled.
+
+    VirtualGrid keeps a small pool of these and rebinds them to different
+    rows while scrolling instead of creating a new frame per row.
+    """
+
+    def __init__(self, parent, width, height, bg, fg):
+        super().__init__(parent, bg=bg, bd=3, relief='ridge', width=width, height=height)
+        self.pack_propagate(False)
+        self.bg, self.fg, self.wrap = bg, fg, width - 30
+        self.item = None
+        self.photo = None
+        self.image = tk.Label(self, bg=bg, fg=fg)
+        self.image.pack(pady=5)
+        self.labels, self.buttons = [], []
+        self.status = tk.Label(self, bg=bg, fg='red')
+
+    def set_image(self, photo, placeholder='No Photo'):
+        self.photo = photo   # keep a reference or Tk drops the image
+        if photo: self.image.configure(image=photo, text='')
+        else: self.image.configure(image='', text=placeholder)
+
+    def show(self, photo, lines, actions=(), status='', placeholder='No Photo'):
+        """Fill the card. `lines` are strings or (text, font); `actions` are (text, command)."""
+        self.set_image(photo, placeholder)
+        for lbl in self.labels + self.buttons: lbl.pack_forget()
+        self.status.pack_forget()
+        for i, line in enumerate(lines):
+            text, font = line if isinstance(line, tuple) else (line, None)
+            if i == len(self.labels):
+                self.labels.append(tk.Label(self, bg=self.bg, fg=self.fg, wraplength=self.wrap, justify='center'))
+            self.labels[i].configure(text=text, font=font or 'TkDefaultFont')
+            self.labels[i].pack(pady=1)
+        for i, (text, cmd) in enumerate(actions):
+            if i == len(self.buttons): self.buttons.append(ttk.Button(self))
+            self.buttons[i].configure(text=text, command=cmd)
+            self.buttons[i].pack(pady=3)
+        if status:
+            self.status.configure(text=status)
+            self.status.pack(pady=5)
+
+# ----------------------------------- VIRTUAL GRID -----------------------------------
+class VirtualGrid(tk.Frame):
+    """Scrollable grid of cards that only builds the cards in view.
+
+    Rows come from `fetch(offset, limit)` one page at a time (or from a
+    plain list via set_items). `render(card, item)` fills a Card; cards
+    that scroll out of view are recycled for the rows scrolling in.
+
+    With a `loader(fn, *args, done=, error=)` that runs fn off the Tk thread
+    and calls back on it, pages are fetched in the background and their
+    cards appear once they arrive.
+    """
+
+    def __init__(self, parent, render, card_size=(260, 400), bg='black', card_bg='gray', fg='white', loader=None):
+        super().__init__(parent, bg=bg)
+        self.render, self.loader = render, loader
+        self.cw, self.ch = card_size[0] + 2 * CARD_PAD, card_size[1] + 2 * CARD_PAD
+        self.card_size, self.card_bg, self.fg = card_size, card_bg, fg
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        sb = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=lambda *a: (sb.set(*a), self.schedule()))
+        self.canvas.pack(side='left', fill='both', expand=True)
+        sb.pack(side='right', fill='y')
+        self.canvas.bind('<Configure>', lambda e: self.schedule())
+        root = self._root()
+        if not getattr(root, '_grid_wheel', False):   # one global handler per Tk root
+            for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'): root.bind_all(seq, on_wheel, add='+')
+            root._grid_wheel = True
+        self.cols = 1
+        self.total, self.fetch, self.pages, self.items = 0, None, {}, None
+        self.loading = {}  # page -> token of the background fetch in flight
+        self.live = {}    # row index -> (card, canvas window id)
+        self.pool = []    # hidden (card, window id) pairs ready for reuse
+        self._job = None
+        self._region = None
+
+    # --------------------------- Data ---------------------------
+    def set_source(self, total, fetch):
+        self.total, self.fetch, self.pages, self.items = total, fetch, {}, None
+        self.loading = {}
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def set_items(self, items):
+        items = list(items)
+        self.set_source(len(items), lambda off, n: items[off:off + n])
+        self.items = items
+
+    def item(self, i):
+        page, off = divmod(i, PAGE_SIZE)
+        if page not in self.pages:
+            if self.loader and self.items is None: self._load(page); return None
+            with perf.span('fetch_page'): self.pages[page] = self.fetch(page * PAGE_SIZE, PAGE_SIZE)
+        rows = self.pages[page]
+        return rows[off] if off < len(rows) else None
+
+    def _load(self, page):
+        if page in self.loading: return
+        token = self.loading[page] = object()
+        fetch = self.fetch
+        def fetch_page():
+            with perf.span('fetch_page'): return fetch(page * PAGE_SIZE, PAGE_SIZE)
+        def loaded(rows):
+            if self.loading.get(page) is not token: return   # source changed or rows removed meanwhile
+            del self.loading[page]
+            self.pages[page] = rows
+            if self.winfo_exists(): self.schedule()
+        def failed(e):
+            if self.loading.get(page) is token: del self.loading[page]   # retried on the next scroll
+            print(f'Failed to load rows: {e}')
+        self.loader(fetch_page, done=loaded, error=failed)
+
+    def refresh(self):
+        """Re-render every visible card, e.g. after the underlying rows changed."""
+        for i in list(self.live): self._release(i)
+        self.schedule()
+
+    def remove(self, item):
+        """Drop the row shown by a visible card and slide the cards after it back one slot.
+
+        With a fetch() source the caller must already have removed the row there.
+        """
+        i = next((k for k, (card, _) in self.live.items() if card.item is item), None)
+        if i is None: return False
+        if self.items is not None: del self.items[i]
+        self.total -= 1
+        self.pages = {p: rows for p, rows in self.pages.items() if p < i // PAGE_SIZE}
+        self.loading = {p: t for p, t in self.loading.items() if p < i // PAGE_SIZE}
+        self._release(i)
+        for j in sorted(k for k in self.live if k > i):
+            card, win = self.live.pop(j)
+            self._place(win, j - 1)
+            self.live[j - 1] = (card, win)
+        self.schedule()   # fills the slot freed at the end of the viewport
+        return True
+
+    def discard(self, items):
+        """Drop rows of a set_items() grid wherever they are, keeping the scroll position."""
+        if self.items is None: return
+        gone = set(items)
+        rows = self.items = [it for it in self.items if it not in gone]
+        self.total, self.fetch, self.pages = len(rows), lambda off, n: rows[off:off + n], {}
+        self.refresh()
+
+    # --------------------------- Layout ---------------------------
+    def schedule(self):
+        if self._job is None: self._job = self.after_idle(self.layout)
+
+    @perf.timed('grid_layout')
+    def layout(self):
+        self._job = None
+        if not self.winfo_exists(): return
+        width = max(self.canvas.winfo_width(), self.cw)
+        cols = max(1, width // self.cw)
+        if cols != self.cols:
+            self.cols = cols
+            for i in list(self.live): self._release(i)
+        rows = -(-self.total // self.cols)
+        region = (0, 0, self.cols * self.cw, rows * self.ch)
+        if region != self._region:   # reconfiguring fires yscrollcommand, which would loop back here
+            self._region = region
+            self.canvas.configure(scrollregion=region)
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // self.ch) - BUFFER_ROWS)
+        last = min(rows, int((top + self.canvas.winfo_height()) // self.ch) + 1 + BUFFER_ROWS)
+        wanted = range(first * self.cols, min(self.total, last * self.cols))
+        for i in [i for i in self.live if i not in wanted]: self._release(i)
+        for i in wanted:
+            if i in self.live: continue
+            item = self.item(i)
+            if item is None: continue
+            card, win = self.pool.pop() if self.pool else self._new_card()
+            self._place(win, i)
+            card.item = item
+            self.render(card, item)
+            self.live[i] = (card, win)
+
+    def _place(self, win, i):
+        r, c = divmod(i, self.cols)
+        self.canvas.coords(win, c * self.cw + CARD_PAD, r * self.ch + CARD_PAD)
+
+    @perf.timed('create_card')
+    def _new_card(self):
+        card = Card(self.canvas, *self.card_size, self.card_bg, self.fg)
+        return card, self.canvas.create_window(-2 * self.cw, -2 * self.ch, window=card, anchor='nw')
+
+    def _release(self, i):
+        card, win = self.live.pop(i)
+        self.canvas.coords(win, -2 * self.cw, -2 * self.ch)   # park it outside the scroll region
+        card.item = None
+        card.set_image(None)
+        self.pool.append((card, win))
+
+
+def on_wheel(e):
+    # scroll whichever grid the pointer is over
+    w = e.widget
+    while w is not None and not isinstance(w, VirtualGrid): w = getattr(w, 'master', None)
+    if w is None: return
+    step = -1 if getattr(e, 'num', 0) == 4 or e.delta > 0 else 1
+    w.canvas.yview_scroll(step * 2, 'units')
@@ -0,0 +1,136 @@
+"""Timings and counters for the hot paths; off unless RESCUE_PERF is set.
+
+    RESCUE_PERF=1 python animal_rescue.py            # histograms + JSON lines in perf.jsonl
+    RESCUE_PERF=profile python animal_rescue.py      # ...and a cProfile of the Tk thread in perf.prof
+
+When disabled, timed() returns the function untouched and span() a shared
+no-op context, so the instrumented code pays next to nothing.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import wraps
+import atexit, json, os, threading, time
+
+# --------------------------------------- CONFIG ---------------------------------------
+MODE = os.environ.get('RESCUE_PERF', '')
+ENABLED = bool(MODE) and MODE != '0'
+LOG_FILE = os.environ.get('RESCUE_PERF_LOG', 'perf.jsonl')
+PROFILE_FILE = os.environ.get('RESCUE_PERF_PROFILE', 'perf.prof')
+BOUNDS = [0.01 * 1.25 ** i for i in range(72)]   # bucket upper bounds in ms: 0.01 ms .. ~100 s
+
+# ------------------------------------- HISTOGRAM -------------------------------------
+class Histogram:
+    """Log-bucketed latency histogram (ms); percentiles are bucket upper bounds."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BOUNDS) + 1)
+        self.count, self.total, self.max = 0, 0.0, 0.0
+
+    def add(self, ms):
+        self.buckets[bisect_left(BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        if not self.count: return 0.0
+        rank, seen = p / 100 * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank: return min(BOUNDS[i] if i < len(BOUNDS) else self.max, self.max)
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'p50': self.percentile(50), 'p95': self.percentile(95),
+                'max': self.max, 'total': self.total}
+
+# -------------------------------------- RECORDER --------------------------------------
+lock = threading.Lock()
+histograms = defaultdict(Histogram)
+counters = defaultdict(int)
+sources = {}    # name -> callable returning a dict of stats (e.g. ThumbnailCache.stats)
+_log = None
+
+
+def record(op, ms, **fields):
+    global _log
+    with lock:
+        histograms[op].add(ms)
+        if _log is None: _log = open(LOG_FILE, 'a', buffering=1, encoding='utf-8')
+        _log.write(json.dumps({'ts': round(time.time(), 3), 'op': op, 'ms': round(ms, 3),
+                               'thread': threading.current_thread().name, **fields}, default=str) + '\n')
+
+
+def count(name, n=1):
+    if ENABLED:
+        with lock: counters[name] += n
+
+
+def mark(op, since):
+    """Record the time from `since` (a perf_counter value) until now, e.g. startup milestones."""
+    if ENABLED: record(op, (time.perf_counter() - since) * 1000)
+
+
+def register(name, stats):
+    sources[name] = stats
+
+
+class _Span:
+    __slots__ = ('op', 'fields', 't')
+
+    def __init__(self, op, fields): self.op, self.fields = op, fields
+
+    def __enter__(self):
+        self.t = time.perf_counter()
+        return self.fields   # callers may add fields (e.g. bytes) before the span closes
+
+    def __exit__(self, *exc):
+        record(self.op, (time.perf_counter() - self.t) * 1000, **self.fields)
+
+
+_OFF = nullcontext({})
+
+
+def span(op, **fields):
+    """with span('save_workbook', path=p) as f: ... ; f['bytes'] = n"""
+    return _Span(op, fields) if ENABLED else _OFF
+
+
+def timed(op=None):
+    """Decorator recording every call of the function under `op` (default: its name)."""
+    def wrap(fn):
+        if not ENABLED: return fn
+        name = op or fn.__name__
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            with span(name): return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def snapshot():
+    """{'ops': {op: summary}, 'counters': {...}, <source>: {...}} for the panel and the log."""
+    with lock:
+        out = {'ops': {op: h.summary() for op, h in sorted(histograms.items())}, 'counters': dict(counters)}
+    for name, stats in sources.items():
+        try: out[name] = stats()
+        except Exception as e: out[name] = {'error': str(e)}
+    return out
+
+
+def _close():
+    global _log
+    summary = snapshot() if histograms else None
+    with lock:
+        if _log and summary: _log.write(json.dumps({'ts': round(time.time(), 3), 'op': 'summary', **summary}, default=str) + '\n')
+        if _log: _log.close(); _log = None
+
+# --------------------------------------- SETUP ---------------------------------------
+if ENABLED:
+    atexit.register(_close)
+    if MODE == 'profile':
+        import cProfile
+        profiler = cProfile.Profile()   # profiles the importing (Tk) thread only
+        profiler.enable()
+        atexit.register(lambda: (profiler.disable(), profiler.dump_stats(PROFILE_FILE)))
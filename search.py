@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+import re, threading
+
+# --------------------------------------- CONFIG ---------------------------------------
+TOKEN = re.compile(r'\w+')
+SORT_KEYS = ('id', 'name', 'species', 'age')
+
+
+def tokens(*texts):
+    return {t.lower() for text in texts if text for t in TOKEN.findall(str(text))}
+
+
+def parse_age(age):
+    try: return float(age)
+    except (TypeError, ValueError): return None
+
+# ------------------------------------ ANIMAL INDEX ------------------------------------
+class AnimalIndex:
+    """In-memory search over animals: word-prefix match on name/species/description,
+    an Age range and sorting. add/remove/update keep it current without a rebuild.
+    """
+
+    def __init__(self, animals=()):
+        self.lock = threading.Lock()
+        self.animals = {}                  # id -> Animal
+        self.postings = defaultdict(set)   # token -> ids
+        self.vocab = []                    # sorted tokens, for prefix lookups
+        self.ages = []                     # sorted (age, id) for animals with a numeric age
+        for a in animals: self.animals[a.id] = a
+        for a in self.animals.values():    # bulk build: sort once at the end, not insort per entry
+            for t in tokens(a.name, a.species, a.description): self.postings[t].add(a.id)
+            age = parse_age(a.age)
+            if age is not None: self.ages.append((age, a.id))
+        self.vocab = sorted(self.postings)
+        self.ages.sort()
+
+    def add(self, a):
+        with self.lock:
+            self.animals[a.id] = a
+            for t in tokens(a.name, a.species, a.description):
+                if t not in self.postings: insort(self.vocab, t)
+                self.postings[t].add(a.id)
+            age = parse_age(a.age)
+            if age is not None: insort(self.ages, (age, a.id))
+
+    def remove(self, aid):
+        with self.lock:
+            a = self.animals.pop(aid, None)
+            if a is None: return
+            for t in tokens(a.name, a.species, a.description):
+                ids = self.postings[t]
+                ids.discard(aid)
+                if not ids:
+                    del self.postings[t]
+                    del self.vocab[bisect_left(self.vocab, t)]
+            age = parse_age(a.age)
+            if age is not None: del self.ages[bisect_left(self.ages, (age, aid))]
+
+    def update(self, a):
+        self.remove(a.id)
+        self.add(a)
+
+    def _matching(self, prefix):
+        i = bisect_left(self.vocab, prefix)
+        ids = set()
+        while i < len(self.vocab) and self.vocab[i].startswith(prefix):
+            ids |= self.postings[self.vocab[i]]
+            i += 1
+        return ids
+
+    def search(self, text='', min_age=None, max_age=None, sort='id', reverse=False):
+        """Animals matching every word of `text` (as a prefix) within [min_age, max_age]."""
+        with self.lock:
+            ids = None
+            for word in sorted(tokens(text), key=len, reverse=True):   # longest (most selective) first
+                found = self._matching(word)
+                ids = found if ids is None else ids & found
+                if not ids: return []
+            if min_age is not None or max_age is not None:
+                lo = bisect_left(self.ages, (float('-inf') if min_age is None else min_age,))
+                hi = bisect_right(self.ages, (float('inf') if max_age is None else max_age, float('inf')))
+                in_range = {aid for _, aid in self.ages[lo:hi]}
+                ids = in_range if ids is None else ids & in_range
+            found = [self.animals[i] for i in (self.animals if ids is None else ids)]
+        if sort == 'age':
+            key = lambda a: (parse_age(a.age) is None, parse_age(a.age) or 0, a.id)
+        elif sort in ('name', 'species'):
+            key = lambda a: (str(getattr(a, sort) or '').lower(), a.id)
+        else:
+            key = lambda a: a.id
+        return sorted(found, key=key, reverse=reverse)
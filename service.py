@@ -0,0 +1,225 @@
+"""Adoption hub operations without any UI: the Tk app and the HTTP API both sit on this."""
+from storage import open_store, export_excel, EXCEL_FILE, Adoption, Request
+from search import AnimalIndex
+from status import AdoptionStatus, ADOPTED
+from auth import Throttle, hash_password, verify_password, dummy_hash
+from collections import namedtuple
+import bulk, ipaddress, os, threading
+
+# --------------------------------------- CONFIG ---------------------------------------
+ADMIN_USER = 'admin'
+# scrypt hash of the admin password ('1234' unless RESCUE_ADMIN_HASH is set);
+# make a new one with: python -c "import auth; print(auth.hash_password('...'))"
+ADMIN_PASS_HASH = os.environ.get('RESCUE_ADMIN_HASH') or (
+    'scrypt$16384$8$1$4e73d377a26015a8609ea225ffb2a324$3a30d4ba8b614dca918efb898585a266'
+    '912fd766721c98b6789996918e717aed01fca59055cac1f72348bbf3ff82ffb1a4ef77d813f2d1a7ce506f7c9d80d823')
+
+
+class ServiceError(Exception):
+    """A request the hub refuses; the message is meant for the user."""
+
+
+# outcome of decide_many(); skipped holds ((animal ID, username), reason)
+DecisionReport = namedtuple('DecisionReport', 'accepted rejected auto_rejected skipped')
+
+
+def _loopback(ip):
+    try: return ipaddress.ip_address(ip).is_loopback
+    except ValueError: return False
+
+
+# -------------------------------------- SERVICE --------------------------------------
+class RescueService:
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.RLock()   # keeps multi-step changes (e.g. accept) atomic
+        self.index, self.index_gen = None, None
+        self.status, self.status_gen = None, None
+        self.throttle = Throttle()
+
+    @classmethod
+    def open(cls, path=EXCEL_FILE):
+        return cls(open_store(path))
+
+    def refresh(self): return self.store.refresh()
+
+    def flush(self): return self.store.flush()
+
+    def checkpoint(self): return self.store.checkpoint()
+
+    # --------------------------- Accounts ---------------------------
+    # hashing is deliberately slow: callers with a UI run these on a worker thread
+    def register(self, username, password, email):
+        if not all([username, password, email]): raise ServiceError('Fill all')
+        if self.store.get_user(username): raise ServiceError('Username taken')   # skip hashing for a known clash
+        if not self.store.add_user(username, hash_password(password), email): raise ServiceError('Username taken')
+
+    def login(self, username, password, ip=None):
+        keys = self._throttle_keys(username, ip)
+        u = self.store.get_user(username)
+        ok, upgrade = verify_password(u.pw_hash if u else dummy_hash(), password or '')
+        if not (u and ok):
+            self.throttle.failed(*keys)
+            raise ServiceError('Invalid cred')
+        self.throttle.succeeded(keys[0])   # an address keeps its count: one good account must not reset it
+        if upgrade:   # old unsalted SHA-256 (or weaker parameters): re-hash now that we know the password
+            self.store.set_pw_hash(username, hash_password(password))
+            u = self.store.get_user(username)
+        return u
+
+    def admin_login(self, username, password, ip=None):
+        keys = self._throttle_keys(ADMIN_USER, ip)
+        if username != ADMIN_USER or not verify_password(ADMIN_PASS_HASH, password or '')[0]:
+            self.throttle.failed(*keys)
+            raise ServiceError('Invalid credentials')
+        self.throttle.succeeded(keys[0])
+
+    def _throttle_keys(self, username, ip):
+        # desks in API mode all reach the server from loopback: counting that address
+        # would let a few typos at one desk lock every desk (admin included) out
+        keys = [('user', username)] + ([('ip', ip)] if ip and not _loopback(ip) else [])
+        wait = self.throttle.wait(*keys)
+        if wait: raise ServiceError(f'Too many attempts, try again in {int(wait) + 1}s')
+        return keys
+
+    # --------------------------- Animals ---------------------------
+    def animals(self, offset=0, limit=None): return self.store.animals(offset, limit)
+
+    def animal_count(self): return self.store.animal_count()
+
+    def get_animal(self, aid): return self.store.get_animal(aid)
+
+    def photos(self, aids):
+        """{animal ID: photo path} for the animals in `aids` that have one."""
+        return {aid: a.photo for aid in aids if (a := self.store.get_animal(aid)) and a.photo}
+
+    def add_animal(self, name, species, age, description):
+        if not all([name, species, age, description]): raise ServiceError('Fill all fields')
+        with self.lock:
+            a = self.store.add_animal(name, species, age, description)
+            if self.index: self.index.add(a)
+            return a
+
+    def delete_animal(self, aid):
+        with self.lock:
+            if not self.store.delete_animal(aid): raise ServiceError('ID not found')
+            if self.index: self.index.remove(aid)
+
+    def set_photo(self, aid, path):
+        with self.lock:
+            if not self.store.set_photo(aid, path): raise ServiceError('ID not found')
+            if self.index: self.index.update(self.store.get_animal(aid))
+
+    def import_animals(self, path, progress=None):
+        report = bulk.import_animals(self.store, path, progress)
+        with self.lock:
+            if self.index:
+                for a in report.added: self.index.add(a)
+        return report
+
+    def search_animals(self, text='', min_age=None, max_age=None, sort='id', reverse=False):
+        return self.animal_index().search(text, min_age, max_age, sort, reverse)
+
+    def animal_index(self):
+        # built on first search, then kept current by the methods above;
+        # rebuilt only when the store re-read its data (another desk's changes)
+        with self.lock:
+            gen = self.store.generation
+            if self.index is None or gen != self.index_gen:
+                self.index, self.index_gen = AnimalIndex(self.store.animals()), gen
+            return self.index
+
+    def export_excel(self, path):
+        export_excel(self.store, path)
+
+    # --------------------------- Adoptions ---------------------------
+    def requests(self): return self.store.requests()
+
+    def pending_count(self): return self.adoption_status().pending_total
+
+    def adoptions(self): return self.store.adoptions()
+
+    def user_overview(self, username):
+        """(adoptions, pending requests) of `username`, from the status index."""
+        return self.adoption_status().for_user(username)
+
+    def adoption_states(self, aids, username=None):
+        """[(state, mine)] per animal ID; `mine` says whether `username` adopted
+        or requested the animal (other users' names are not given out)."""
+        st = self.adoption_status()
+        out = []
+        for aid in aids:
+            state, who = st.state(aid)
+            out.append((state, who == username if state == ADOPTED else bool(who) and username in who))
+        return out
+
+    def adoption_status(self):
+        # same lifecycle as animal_index(): built once, updated by request/decide
+        with self.lock:
+            gen = self.store.generation
+            if self.status is None or gen != self.status_gen:
+                self.status, self.status_gen = AdoptionStatus(self.store.adoptions(), self.store.requests()), gen
+            return self.status
+
+    def request_adoption(self, aid, username, email=None):
+        """File a request by a registered user; `email` defaults to the one they registered."""
+        u = self.store.get_user(username)
+        if not u: raise ServiceError('Unknown user')
+        email = email or u.email
+        a = self.store.get_animal(aid)
+        if not a: raise ServiceError('ID not found')
+        with self.lock:
+            st = self.adoption_status()
+            if st.state(aid)[0] == ADOPTED: raise ServiceError('Already adopted')
+            if st.requested_by(aid, username): raise ServiceError('Already requested')
+            self.store.add_request(aid, a.name, username, email)
+            st.add_request(Request(aid, a.name, username, email))
+        return a
+
+    def decide(self, aid, username, accept):
+        """Accept or reject the pending request of `username` for animal `aid`."""
+        report = self.decide_many([(aid, username, accept)])
+        if report.skipped: raise ServiceError(report.skipped[0][1])
+        return (report.accepted or report.rejected)[0]
+
+    def decide_many(self, decisions):
+        """Apply (animal ID, username, accept) decisions together, as one batch.
+
+        Rejections go first; accepting a request then adopts the animal and
+        rejects every other request still pending for it. Decisions that no
+        longer apply (request gone, animal already adopted) are skipped; a
+        decision on a request this batch already settled is reported once,
+        under what happened to it. Like every write, it is saved by the
+        next flush().
+
+        On an Excel store, another desk may save an adoption of the same
+        animal between this call and that flush; the other desk's adoption
+        then wins when the journals are merged, even though this report
+        listed the request as accepted.
+        """
+        accepted, rejected, auto, skipped = [], [], [], []
+        with self.lock:
+            self.store.refresh()   # decide on what other desks have saved, not on a stale view
+            st = self.adoption_status()
+            drop = []
+            def remove(q):
+                drop.append((q.animal_id, q.username))
+                st.remove_request(q.animal_id, q.username)
+            with self.store.batch():
+                for aid, username, accept in sorted(decisions, key=lambda d: bool(d[2])):
+                    if (aid, username) in drop: continue
+                    q = st.request(aid, username)
+                    state, who = st.state(aid)
+                    if accept and state == ADOPTED: skipped.append(((aid, username), f'Already adopted by {who}'))
+                    elif not q: skipped.append(((aid, username), 'Request not found'))
+                    elif not accept:
+                        remove(q); rejected.append(q)
+                    elif not self.store.add_adoption(*q):   # another desk got there since the index was built
+                        skipped.append(((aid, username), 'Already adopted'))
+                    else:
+                        st.add_adoption(Adoption(*q))
+                        remove(q); accepted.append(q)
+                        for other in st.requests_for(aid):
+                            remove(other); auto.append(other)
+                if drop: self.store.remove_requests(drop)
+        return DecisionReport(accepted, rejected, auto, skipped)
@@ -0,0 +1,65 @@
+from collections import defaultdict
+import threading
+
+# --------------------------------------- CONFIG ---------------------------------------
+AVAILABLE, PENDING, ADOPTED = 'available', 'pending', 'adopted'
+
+# ---------------------------------- ADOPTION STATUS ----------------------------------
+class AdoptionStatus:
+    """Where every animal stands and what every user has asked for or adopted.
+
+    Built once from the Adoptions and AdoptionRequests tables, then kept in
+    step by add_request/remove_request/add_adoption, so per-animal and
+    per-user lookups never scan the full tables.
+    """
+
+    def __init__(self, adoptions=(), requests=()):
+        self.lock = threading.Lock()
+        self.adopted = {}                          # animal ID -> Adoption
+        self.pending = defaultdict(dict)           # animal ID -> {username: Request}
+        self.by_user = defaultdict(list)           # username -> [Adoption]
+        self.requested = defaultdict(dict)         # username -> {animal ID: Request}
+        self.pending_total = 0
+        for ad in adoptions: self.add_adoption(ad)
+        for r in requests: self.add_request(r)
+
+    def add_request(self, r):
+        with self.lock:
+            if r.username in self.pending[r.animal_id]: return
+            self.pending[r.animal_id][r.username] = r
+            self.requested[r.username][r.animal_id] = r
+            self.pending_total += 1
+
+    def remove_request(self, aid, username):
+        with self.lock:
+            if self.pending.get(aid, {}).pop(username, None) is None: return
+            if not self.pending[aid]: del self.pending[aid]
+            self.requested[username].pop(aid, None)
+            self.pending_total -= 1
+
+    def add_adoption(self, ad):
+        with self.lock:
+            self.adopted.setdefault(ad.animal_id, ad)
+            self.by_user[ad.username].append(ad)
+
+    def state(self, aid):
+        """(ADOPTED, username), (PENDING, [usernames]) or (AVAILABLE, None)."""
+        with self.lock:
+            if aid in self.adopted: return ADOPTED, self.adopted[aid].username
+            if self.pending.get(aid): return PENDING, list(self.pending[aid])
+            return AVAILABLE, None
+
+    def for_user(self, username):
+        """(adoptions, pending requests) of one user."""
+        with self.lock:
+            return list(self.by_user.get(username, ())), list(self.requested.get(username, {}).values())
+
+    def requested_by(self, aid, username):
+        with self.lock: return username in self.pending.get(aid, {})
+
+    def request(self, aid, username):
+        with self.lock: return self.pending.get(aid, {}).get(username)
+
+    def requests_for(self, aid):
+        """Every pending request for one animal."""
+        with self.lock: return list(self.pending.get(aid, {}).values())
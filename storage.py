@@ -0,0 +1,645 @@
+from bisect import insort
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+import json, os, sqlite3, sys, tempfile, threading, time
+import perf
+try: import fcntl
+except ImportError: fcntl = None; import msvcrt   # Windows
+
+# --------------------------------------- CONFIG ---------------------------------------
+EXCEL_FILE = 'animal_data.xlsx'
+SQLITE_EXTS = ('.db', '.sqlite', '.sqlite3')
+
+Animal = namedtuple('Animal', 'id name species age description photo')
+User = namedtuple('User', 'username pw_hash email')
+Adoption = namedtuple('Adoption', 'animal_id animal_name username email')
+Request = namedtuple('Request', 'animal_id animal_name username email')
+Meta = namedtuple('Meta', 'key value')
+
+# sheet name -> (row type, header row); order is the order of sheets in the workbook
+SHEETS = {
+    'Animals': (Animal, ['ID','Name','Species','Age','Description','Photo']),
+    'Users': (User, ['Username','PasswordHash','Email']),
+    'Adoptions': (Adoption, ['Animal ID','Animal Name','Adopter Username','Adopter Email']),
+    'AdoptionRequests': (Request, ['Animal ID','Animal Name','Username','User Email']),
+    'Meta': (Meta, ['Key','Value']),
+}
+
+NEXT_ID = 'NextAnimalID'   # Meta key of the animal ID sequence; IDs are never reused
+JOURNAL_SEQ = 'JournalSeq' # Meta key: last journal entry already folded into the workbook
+COMPACT_MIN = 64           # tombstones tolerated before the Animals table is compacted
+CHECKPOINT_OPS = 500       # journal entries ...
+CHECKPOINT_BYTES = 1 << 20 # ... or bytes ...
+CHECKPOINT_SECS = 300      # ... or seconds before a flush folds the journal into the workbook
+
+# ops whose first argument is an animal ID (remapped when a replay renumbers new animals)
+ANIMAL_OPS = {'delete_animal', 'set_photo', 'add_adoption', 'add_request'}
+
+
+class ConflictError(Exception):
+    """The data file was replaced by a writer that does not take the lock."""
+
+# ----------------------------------- UTIL FUNCTIONS ----------------------------------
+def ensure_excel(path=EXCEL_FILE):
+    if not os.path.exists(path):
+        from openpyxl import Workbook   # openpyxl is imported on first use: it is most of our startup time
+        wb = Workbook()
+        wb.remove(wb.active)
+        for name, (_, header) in SHEETS.items():
+            wb.create_sheet(name).append(header)
+        atomic_save(wb, path)
+
+
+@contextmanager
+def file_lock(path):
+    """Advisory exclusive lock on `path`.lock, honoured by every process using the store."""
+    with open(path + '.lock', 'a+b') as f:
+        if fcntl: fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            while True:
+                try: f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1); break
+                except OSError: pass   # LK_LOCK gives up after ~10s; keep waiting
+        try: yield
+        finally:
+            if fcntl: fcntl.flock(f, fcntl.LOCK_UN)
+            else: f.seek(0); msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def file_stamp(path):
+    # cheap version of the file: changes whenever anyone rewrites it
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def atomic_save(wb, path, expect=None):
+    """Save via a temp file + os.replace so a crash never leaves a half-written file.
+
+    With `expect`, refuse (ConflictError) if the file's stamp no longer matches it.
+    Returns the stamp of the new file.
+    """
+    fd, tmp = tempfile.mkstemp(suffix='.xlsx', prefix='.tmp-', dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as f, perf.span('save_workbook') as info:
+            wb.save(f)
+            f.flush()
+            os.fsync(f.fileno())
+            info['bytes'] = f.tell()
+        if expect is not None and file_stamp(path) != expect:
+            raise ConflictError(f'{path} changed during save')
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+    return file_stamp(path)
+
+
+def read_rows(ws, cls):
+    width = len(cls._fields)
+    rows = []
+    for r in ws.iter_rows(min_row=2, values_only=True):
+        if all(v is None for v in r): continue
+        rows.append(cls(*(tuple(r) + (None,) * width)[:width]))
+    return rows
+
+
+def export_excel(store, path):
+    """Stream every sheet of `store` into a write-only workbook."""
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for name, (_, header) in SHEETS.items():
+        ws = wb.create_sheet(name)
+        ws.append(header)
+        for row in store.rows(name): ws.append(list(row))
+    atomic_save(wb, path)
+
+
+def open_store(path=EXCEL_FILE):
+    """Pick the backend from the file extension: SQLite for .db/.sqlite, else Excel."""
+    if path.lower().endswith(SQLITE_EXTS):
+        fresh = not os.path.exists(path)
+        store = SqliteStore(path)
+        # first run against a new database: carry over the existing workbook
+        if fresh and os.path.exists(EXCEL_FILE): store.import_excel(EXCEL_FILE)
+        return store
+    return ExcelStore(path)
+
+# ------------------------------------ EXCEL STORE ------------------------------------
+class ExcelStore:
+    """Workbook loaded once and kept in memory as typed tables.
+
+    Mutations only touch the in-memory tables and are remembered as pending
+    ops. flush() appends them to `<file>.journal` (one JSON line per op,
+    fsync'd) under the cross-process lock, which costs milliseconds however
+    big the workbook is. Loading applies the journal on top of the workbook;
+    every so often flush() (or checkpoint()) folds the journal into the
+    workbook with one atomic save, so the xlsx stays the canonical copy.
+    If another process wrote since we read, we rebuild from its data and
+    replay our pending ops on top (optimistic concurrency), so concurrent
+    desks merge instead of overwriting each other.
+    """
+
+    def __init__(self, path=EXCEL_FILE):
+        self.path = path
+        self.journal = path + '.journal'
+        self.lock = threading.RLock()        # guards the tables
+        self.save_lock = threading.Lock()    # one load/save of the file per process at a time
+        self.dirty = set()                   # sheets that differ from self.wb
+        self.pending = []                    # (op, args, result) not yet in the journal
+        self.stamp = self.jstamp = None
+        self.wb = self.base = None           # the workbook and its tables as read, before the journal
+        self.seq = 0                         # last journal entry applied
+        self.journal_ops = self.journal_end = 0
+        self.checkpointed = time.monotonic()
+        self.generation = 0                  # bumped whenever the tables are re-read
+        self.load()
+
+    # --------------------------- Load / Save ---------------------------
+    def load(self, locked=False):
+        """Rebuild the tables from the workbook and the journal, then replay unsaved ops on top."""
+        with nullcontext() if locked else file_lock(self.path):   # flock isn't re-entrant across fds
+            ensure_excel(self.path)
+            stamp = file_stamp(self.path)
+            wb, base = self.wb, self.base
+            if stamp != self.stamp:   # only the journal changed: no need to parse the zip again
+                from openpyxl import load_workbook
+                with perf.span('load_workbook', bytes=stamp[1]):
+                    wb = load_workbook(self.path)
+                # workbooks from before the Meta sheet existed simply have no sequence yet
+                base = {name: read_rows(wb[name], cls) if name in wb.sheetnames else []
+                        for name, (cls, _) in SHEETS.items()}
+            entries, self.journal_end = self._read_journal()
+            jstamp = self._journal_stamp()
+        tables = {name: list(rows) for name, rows in base.items()}
+        with self.lock:
+            self.wb, self.base, self.tables, self.stamp, self.jstamp = wb, base, tables, stamp, jstamp
+            self.generation += 1
+            self.tombstones = []
+            self.animal_idx = {a.id: i for i, a in enumerate(tables['Animals'])}
+            self.user_idx = {}
+            for i, u in enumerate(tables['Users']): self.user_idx.setdefault(u.username, i)
+            meta = dict(tables['Meta'])
+            top = max((a.id for a in tables['Animals'] if isinstance(a.id, int)), default=0)
+            self.next_id = max(int(meta.get(NEXT_ID) or 0), top + 1)
+            pending, self.pending, self.dirty = self.pending, [], set()
+            self.seq = folded = int(meta.get(JOURNAL_SEQ) or 0)
+            for e in entries:
+                if e['seq'] <= folded: continue   # already in the workbook (crash before the journal was emptied)
+                getattr(self, '_' + e['op'])(*e['args'])
+                self.seq = e['seq']
+            self.journal_ops = self.seq - folded
+            self._replay(pending)
+        return True
+
+    def refresh(self):
+        try: stamp = file_stamp(self.path), self._journal_stamp()
+        except OSError: return False
+        if stamp == (self.stamp, self.jstamp): return False
+        if not self.save_lock.acquire(blocking=False): return False   # our own save is in progress
+        try: return self.load()
+        finally: self.save_lock.release()
+
+    def flush(self):
+        """Journal the pending ops; fold the journal into the workbook once it has grown."""
+        with self.save_lock, file_lock(self.path):
+            written = self._sync()
+            if self.journal_ops and (self.journal_ops >= CHECKPOINT_OPS or self.journal_end >= CHECKPOINT_BYTES
+                                     or time.monotonic() - self.checkpointed >= CHECKPOINT_SECS):
+                self._checkpoint()
+            return written
+
+    def checkpoint(self):
+        """Write everything into the workbook now and empty the journal (e.g. on exit)."""
+        with self.save_lock, file_lock(self.path):
+            self._sync()
+            if self.journal_ops or self.dirty: self._checkpoint()
+
+    def _sync(self):
+        # caller holds save_lock and the file lock
+        if (file_stamp(self.path), self._journal_stamp()) != (self.stamp, self.jstamp):
+            self.load(locked=True)   # someone else wrote: rebuild from their data, replay ours on top
+        with self.lock: return self._append_pending()
+
+    def _append_pending(self):
+        # caller holds self.lock, so the ops and their sequence numbers stay in step
+        if not self.pending: return False
+        lines = ''.join(json.dumps({'seq': self.seq + n, 'op': op, 'args': args}) + '\n'
+                        for n, (op, args, _) in enumerate(self.pending, 1))
+        with perf.span('append_journal', ops=len(self.pending)), open(self.journal, 'ab') as f:
+            f.truncate(self.journal_end)   # drop a line torn by a crash mid-append
+            f.write(lines.encode())
+            f.flush()
+            os.fsync(f.fileno())
+            self.journal_end = f.tell()
+        self.seq += len(self.pending)
+        self.journal_ops += len(self.pending)
+        self.pending = []
+        self.jstamp = self._journal_stamp()
+        return True
+
+    def _checkpoint(self):
+        # caller holds save_lock and the file lock; the workbook is saved outside self.lock
+        # so the UI can keep editing (those edits stay pending for the next flush)
+        with self.lock:
+            self._append_pending()
+            self._set_meta(JOURNAL_SEQ, self.seq)
+            names, self.dirty = self.dirty, set()
+            with perf.span('write_sheets', sheets=sorted(names)):
+                for name in names: self._write_sheet(name)
+            base = {name: list(rows) for name, rows in self.tables.items()}
+        try:
+            # a writer that ignores the lock may still have replaced the file meanwhile;
+            # nothing is lost then, the journal still holds every op
+            stamp = atomic_save(self.wb, self.path, expect=self.stamp)
+        except Exception:
+            with self.lock: self.stamp = None   # self.wb is half-updated: re-read the file before trusting it
+            raise
+        # the workbook now has every entry up to self.seq; a crash before this
+        # truncation is harmless since load() skips entries <= JournalSeq
+        with open(self.journal, 'wb') as f: os.fsync(f.fileno())
+        with self.lock:
+            self.stamp, self.base, self.jstamp = stamp, base, self._journal_stamp()
+            self.journal_ops = self.journal_end = 0
+            self.checkpointed = time.monotonic()
+
+    def _read_journal(self):
+        """(entries, end of the last complete line) of the journal file."""
+        entries, end = [], 0
+        try: f = open(self.journal, 'rb')
+        except FileNotFoundError: return entries, end
+        with f:
+            for line in f:
+                if not line.endswith(b'\n'): break   # torn by a crash mid-append
+                try: entries.append(json.loads(line))
+                except ValueError: break
+                end += len(line)
+        return entries, end
+
+    def _journal_stamp(self):
+        try: return file_stamp(self.journal)
+        except FileNotFoundError: return None
+
+    def rows(self, sheet):
+        with self.lock:
+            return [r for r in self.tables[sheet] if r is not None]
+
+    def _write_sheet(self, name):
+        if name == 'Animals': self.compact()
+        idx = self.wb.sheetnames.index(name) if name in self.wb.sheetnames else len(self.wb.sheetnames)
+        if name in self.wb.sheetnames: self.wb.remove(self.wb[name])
+        ws = self.wb.create_sheet(name, idx)
+        ws.append(SHEETS[name][1])
+        for row in self.tables[name]: ws.append(list(row))
+
+    # --------------------------- Pending ops ---------------------------
+    # Every mutation goes through _do() so it can be replayed on a fresher
+    # copy of the file. Animals added here may get different IDs on replay;
+    # `remap` carries the new IDs into the later ops that refer to them.
+    def _do(self, op, *args):
+        with self.lock:
+            result = getattr(self, '_' + op)(*args)
+            self.pending.append((op, args, result))
+            return result
+
+    def _replay(self, pending):
+        remap = {}
+        def renumber(op, args):
+            if op in ANIMAL_OPS: return [remap.get(args[0], args[0]), *args[1:]]
+            if op == 'remove_requests': return [[[remap.get(aid, aid), user] for aid, user in args[0]]]
+            if op == 'batch': return [[[o, renumber(o, a)] for o, a in args[0]]]
+            return args
+        for op, args, result in pending:
+            if op == 'add_animals':
+                added = self._do(op, *args)
+                remap.update((old.id, new.id) for old, new in zip(result, added) if old.id != new.id)
+            else:
+                self._do(op, *renumber(op, args))
+
+    @contextmanager
+    def batch(self):
+        """Group the ops made inside into one pending op (one journal line), so they
+        are saved, replayed and read back all together or not at all."""
+        with self.lock:
+            start = len(self.pending)
+            try: yield
+            finally:
+                ops = self.pending[start:]
+                if len(ops) > 1:
+                    self.pending[start:] = [('batch', ([[op, list(args)] for op, args, _ in ops],), [r for _, _, r in ops])]
+
+    def _batch(self, ops):
+        return [getattr(self, '_' + op)(*args) for op, args in ops]
+
+    # --------------------------- Animals ---------------------------
+    # Deleted animals leave a None tombstone so a delete never shifts the rows
+    # (and index entries) after it. `tombstones` holds their positions, sorted,
+    # so paging can skip them; compact() squeezes them out in one pass once
+    # there are many, and before the table is written.
+    def compact(self):
+        with self.lock:
+            if not self.tombstones: return
+            rows = self.tables['Animals'] = [a for a in self.tables['Animals'] if a is not None]
+            self.animal_idx = {a.id: i for i, a in enumerate(rows)}
+            self.tombstones = []
+
+    def animals(self, offset=0, limit=None):
+        with self.lock:
+            rows = self.tables['Animals']
+            if not self.tombstones: return rows[offset:None if limit is None else offset + limit]
+            start = offset   # position of the offset-th live row
+            for t in self.tombstones:
+                if t > start: break
+                start += 1
+            live = (a for a in islice(rows, start, None) if a is not None)
+            return list(islice(live, limit))
+
+    def animal_count(self):
+        with self.lock: return len(self.tables['Animals']) - len(self.tombstones)
+
+    def get_animal(self, aid):
+        with self.lock:
+            i = self.animal_idx.get(aid)
+            return None if i is None else self.tables['Animals'][i]
+
+    def add_animal(self, name, species, age, description, photo=''):
+        return self.add_animals([(name, species, age, description, photo)])[0]
+
+    def add_animals(self, records):
+        """Append many (name, species, age, description, photo) records at once."""
+        return self._do('add_animals', list(records))
+
+    def _add_animals(self, records):
+        rows = self.tables['Animals']
+        added = []
+        for rec in records:
+            a = Animal(self.next_id, *rec)
+            self.next_id += 1
+            self.animal_idx[a.id] = len(rows)
+            rows.append(a)
+            added.append(a)
+        if added:
+            self._set_meta(NEXT_ID, self.next_id)
+            self.dirty.add('Animals')
+        return added
+
+    def delete_animal(self, aid): return self._do('delete_animal', aid)
+
+    def _delete_animal(self, aid):
+        i = self.animal_idx.pop(aid, None)
+        if i is None: return False
+        rows = self.tables['Animals']
+        rows[i] = None
+        insort(self.tombstones, i)
+        if len(self.tombstones) > max(COMPACT_MIN, len(rows) // 4): self.compact()
+        self.dirty.add('Animals')
+        return True
+
+    def set_photo(self, aid, path): return self._do('set_photo', aid, path)
+
+    def _set_photo(self, aid, path):
+        i = self.animal_idx.get(aid)
+        if i is None: return False
+        rows = self.tables['Animals']
+        rows[i] = rows[i]._replace(photo=path)
+        self.dirty.add('Animals')
+        return True
+
+    def _set_meta(self, key, value):
+        meta = self.tables['Meta']
+        for i, m in enumerate(meta):
+            if m.key == key: meta[i] = Meta(key, value); break
+        else: meta.append(Meta(key, value))
+        self.dirty.add('Meta')
+
+    # --------------------------- Users ---------------------------
+    def get_user(self, username):
+        with self.lock:
+            i = self.user_idx.get(username)
+            return None if i is None else self.tables['Users'][i]
+
+    def add_user(self, username, pw_hash, email):
+        # taken under the file lock after catching up with other desks, and journaled
+        # at once: a username two desks both took would only be found clashing at replay
+        with self.save_lock, file_lock(self.path):
+            self._sync()
+            with self.lock:
+                added = self._do('add_user', username, pw_hash, email)
+                self._append_pending()
+                return added
+
+    def _add_user(self, username, pw_hash, email):
+        if username in self.user_idx: return False
+        rows = self.tables['Users']
+        self.user_idx[username] = len(rows)
+        rows.append(User(username, pw_hash, email))
+        self.dirty.add('Users')
+        return True
+
+    def set_pw_hash(self, username, pw_hash): return self._do('set_pw_hash', username, pw_hash)
+
+    def _set_pw_hash(self, username, pw_hash):
+        i = self.user_idx.get(username)
+        if i is None: return False
+        rows = self.tables['Users']
+        rows[i] = rows[i]._replace(pw_hash=pw_hash)
+        self.dirty.add('Users')
+        return True
+
+    # --------------------------- Adoptions / Requests ---------------------------
+    def adoptions(self):
+        with self.lock: return list(self.tables['Adoptions'])
+
+    def add_adoption(self, aid, name, username, email):
+        """False if the animal is already adopted."""
+        return self._do('add_adoption', aid, name, username, email)
+
+    def _add_adoption(self, aid, name, username, email):
+        # on replay another desk may have had the animal adopted meanwhile: first one wins,
+        # and the desk whose adoption is dropped only sees it on its next reload
+        rows = self.tables['Adoptions']
+        if any(r.animal_id == aid for r in rows): return False
+        rows.append(Adoption(aid, name, username, email))
+        self.dirty.add('Adoptions')
+        return True
+
+    def requests(self):
+        with self.lock: return list(self.tables['AdoptionRequests'])
+
+    def add_request(self, aid, name, username, email): self._do('add_request', aid, name, username, email)
+
+    def _add_request(self, aid, name, username, email):
+        self.tables['AdoptionRequests'].append(Request(aid, name, username, email))
+        self.dirty.add('AdoptionRequests')
+
+    def remove_requests(self, pairs):
+        """Remove every request matching one of the (animal ID, username) pairs, in one pass."""
+        return self._do('remove_requests', [list(p) for p in pairs])
+
+    def _remove_requests(self, pairs):
+        gone = {tuple(p) for p in pairs}
+        rows = self.tables['AdoptionRequests']
+        kept = [r for r in rows if (r.animal_id, r.username) not in gone]
+        if len(kept) == len(rows): return 0
+        self.tables['AdoptionRequests'] = kept
+        self.dirty.add('AdoptionRequests')
+        return len(rows) - len(kept)
+
+# ------------------------------------ SQLITE STORE ------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS animals (id INTEGER PRIMARY KEY, name TEXT, species TEXT, age TEXT, description TEXT, photo TEXT);
+CREATE TABLE IF NOT EXISTS users (username TEXT NOT NULL, pw_hash TEXT, email TEXT);
+CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users(username);
+CREATE TABLE IF NOT EXISTS adoptions (animal_id INTEGER, animal_name TEXT, username TEXT, email TEXT);
+CREATE TABLE IF NOT EXISTS requests (animal_id INTEGER, animal_name TEXT, username TEXT, email TEXT);
+CREATE INDEX IF NOT EXISTS requests_animal_username ON requests(animal_id, username);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+# sheet name -> table name, for Excel import/export
+TABLES = {'Animals': 'animals', 'Users': 'users', 'Adoptions': 'adoptions', 'AdoptionRequests': 'requests', 'Meta': 'meta'}
+
+
+class SqliteStore:
+    """Same interface as ExcelStore, backed by an indexed SQLite database.
+
+    Lookups by animal ID, username and (animal ID, username) go through
+    B-tree indexes. Every mutation commits straight away, so flush() and
+    refresh() have nothing to do.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        self.batching = 0
+
+    def _all(self, cls, sql, args=()):
+        with self.lock: return [cls(*r) for r in self.db.execute(sql, args)]
+
+    def _one(self, cls, sql, args=()):
+        with self.lock: r = self.db.execute(sql, args).fetchone()
+        return None if r is None else cls(*r)
+
+    def _write(self, sql, args=()):
+        with self.lock, nullcontext() if self.batching else self.db: return self.db.execute(sql, args).rowcount
+
+    @contextmanager
+    def batch(self):
+        """Run the writes made inside as one transaction, holding the write lock
+        from the start so checks made inside see every other connection's commits."""
+        with self.lock, self.db:
+            if not self.db.in_transaction: self.db.execute('BEGIN IMMEDIATE')
+            self.batching += 1
+            try: yield
+            finally: self.batching -= 1
+
+    def refresh(self): return False
+
+    def flush(self): return False
+
+    def checkpoint(self): return False
+
+    @property
+    def generation(self):
+        # changes when another connection commits, like ExcelStore.generation on a reload
+        with self.lock: return self.db.execute('PRAGMA data_version').fetchone()[0]
+
+    def rows(self, sheet):
+        # a cursor, so exports stream instead of materialising the table
+        cur = self.db.cursor()
+        with self.lock: cur.execute(f'SELECT * FROM {TABLES[sheet]} ORDER BY rowid')
+        return cur
+
+    # --------------------------- Animals ---------------------------
+    def animals(self, offset=0, limit=None):
+        return self._all(Animal, 'SELECT * FROM animals ORDER BY id LIMIT ? OFFSET ?',
+                         (-1 if limit is None else limit, offset))
+
+    def animal_count(self):
+        with self.lock: return self.db.execute('SELECT COUNT(*) FROM animals').fetchone()[0]
+
+    def get_animal(self, aid):
+        return self._one(Animal, 'SELECT * FROM animals WHERE id=?', (aid,))
+
+    def add_animal(self, name, species, age, description, photo=''):
+        return self.add_animals([(name, species, age, description, photo)])[0]
+
+    def add_animals(self, records):
+        records = list(records)
+        with self.lock, self.db:   # one transaction for the whole batch, sequence included
+            start = self._reserve_ids(len(records))
+            added = [Animal(start + i, *rec) for i, rec in enumerate(records)]
+            self.db.executemany('INSERT INTO animals VALUES (?,?,?,?,?,?)', added)
+            return added
+
+    def _reserve_ids(self, n):
+        row = self.db.execute('SELECT value FROM meta WHERE key=?', (NEXT_ID,)).fetchone()
+        top = self.db.execute('SELECT COALESCE(MAX(id), 0) FROM animals').fetchone()[0]
+        start = max(int(row[0]) if row else 0, top + 1)
+        self.db.execute('INSERT OR REPLACE INTO meta VALUES (?,?)', (NEXT_ID, start + n))
+        return start
+
+    def delete_animal(self, aid):
+        return self._write('DELETE FROM animals WHERE id=?', (aid,)) > 0
+
+    def set_photo(self, aid, path):
+        return self._write('UPDATE animals SET photo=? WHERE id=?', (path, aid)) > 0
+
+    # --------------------------- Users ---------------------------
+    def get_user(self, username):
+        return self._one(User, 'SELECT * FROM users WHERE username=?', (username,))
+
+    def add_user(self, username, pw_hash, email):
+        return self._write('INSERT OR IGNORE INTO users VALUES (?,?,?)', (username, pw_hash, email)) > 0
+
+    def set_pw_hash(self, username, pw_hash):
+        return self._write('UPDATE users SET pw_hash=? WHERE username=?', (pw_hash, username)) > 0
+
+    # --------------------------- Adoptions / Requests ---------------------------
+    def adoptions(self):
+        return self._all(Adoption, 'SELECT * FROM adoptions ORDER BY rowid')
+
+    def add_adoption(self, aid, name, username, email):
+        return self._write('INSERT INTO adoptions SELECT ?,?,?,? WHERE NOT EXISTS '
+                           '(SELECT 1 FROM adoptions WHERE animal_id=?)', (aid, name, username, email, aid)) > 0
+
+    def requests(self):
+        return self._all(Request, 'SELECT * FROM requests ORDER BY rowid')
+
+    def add_request(self, aid, name, username, email):
+        self._write('INSERT INTO requests VALUES (?,?,?,?)', (aid, name, username, email))
+
+    def remove_requests(self, pairs):
+        with self.lock, nullcontext() if self.batching else self.db:
+            cur = self.db.executemany('DELETE FROM requests WHERE animal_id=? AND username=?', [tuple(p) for p in pairs])
+            return cur.rowcount
+
+    # --------------------------- Excel import / export ---------------------------
+    def import_excel(self, path):
+        """Replace the database contents with the sheets of an xlsx file."""
+        if os.path.exists(path + '.journal'): ExcelStore(path).checkpoint()   # fold in its unsaved journal first
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True)
+        with self.lock, self.db:
+            for sheet, table in TABLES.items():
+                cls = SHEETS[sheet][0]
+                self.db.execute(f'DELETE FROM {table}')
+                if sheet in wb.sheetnames:
+                    marks = ','.join('?' * len(cls._fields))
+                    self.db.executemany(f'INSERT OR IGNORE INTO {table} VALUES ({marks})', read_rows(wb[sheet], cls))
+        wb.close()
+
+    def export_excel(self, path):
+        export_excel(self, path)
+
+
+if __name__ == '__main__':
+    # python storage.py import animal_data.xlsx animal_data.db
+    # python storage.py export animal_data.db animal_data.xlsx
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export'):
+        sys.exit('usage: storage.py import XLSX DB | export DB XLSX')
+    cmd, src, dst = sys.argv[1:]
+    if cmd == 'import': SqliteStore(dst).import_excel(src)
+    else: SqliteStore(src).export_excel(dst)
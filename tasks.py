@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue, tkinter as tk, traceback
+import perf
+
+# --------------------------------------- CONFIG ---------------------------------------
+POLL_MS = 30     # how often the Tk thread drains finished tasks
+WORKERS = 4      # decode threads; storage I/O has its own single thread
+
+# ------------------------------------ TASK RUNNER ------------------------------------
+class TaskRunner:
+    """Runs blocking work off the Tk thread and hands results back to it.
+
+    Tk may only be touched from the mainloop thread, so finished futures go
+    into a queue that a root.after poll drains, calling `done(result)` or
+    `error(exc)` there. Storage work (io=True) runs on one dedicated thread
+    so loads and saves never overlap or reorder.
+    """
+
+    def __init__(self, root, workers=WORKERS):
+        self.root = root
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='rescue-worker')
+        self.io = ThreadPoolExecutor(1, thread_name_prefix='rescue-io')
+        self.finished = queue.Queue()
+        self._job = root.after(POLL_MS, self.poll)
+
+    def submit(self, fn, *args, done=None, error=None, io=False):
+        fut = (self.io if io else self.pool).submit(perf.timed('task ' + getattr(fn, '__name__', '?'))(fn), *args)
+        fut.add_done_callback(lambda f: self.finished.put((f, done, error)))
+        return fut
+
+    def post(self, fn, *args):
+        """Call fn(*args) on the Tk thread; safe to use from workers (e.g. progress)."""
+        self.finished.put((None, lambda _: fn(*args), None))
+
+    def poll(self):
+        while True:
+            try: fut, done, error = self.finished.get_nowait()
+            except queue.Empty: break
+            try:
+                exc = fut and fut.exception()
+                if exc is None:
+                    if done: done(fut and fut.result())
+                elif error: error(exc)
+                else: traceback.print_exception(exc)
+            except tk.TclError:
+                pass   # the widget the result was meant for is gone
+            except Exception:
+                traceback.print_exc()
+        self._job = self.root.after(POLL_MS, self.poll)
+
+    def shutdown(self):
+        """Wait for queued work (pending saves in particular) and stop polling."""
+        self.root.after_cancel(self._job)
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.io.shutdown(wait=True)
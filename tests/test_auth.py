@@ -0,0 +1,91 @@
+"""Password hashing, login and the failed-login throttle."""
+import hashlib
+import pytest
+import auth, service
+from auth import Throttle, hash_password, legacy_hash, verify_password
+from service import RescueService, ServiceError
+
+
+@pytest.fixture
+def svc(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, 'ADMIN_PASS_HASH', hash_password('1234'))   # whatever RESCUE_ADMIN_HASH says
+    svc = RescueService.open(str(tmp_path / 'animal_data.db'))
+    svc.register('ann', 'secret', 'ann@example.org')
+    return svc
+
+
+def pbkdf2(pw, iterations):
+    salt = b'\1' * auth.SALT_BYTES
+    return f"pbkdf2${iterations}${salt.hex()}${hashlib.pbkdf2_hmac('sha256', pw.encode(), salt, iterations).hex()}"
+
+
+def test_verify_password_formats():
+    assert verify_password(hash_password('pw'), 'pw') == (True, False)
+    assert verify_password(hash_password('pw'), 'nope')[0] is False
+    assert verify_password(legacy_hash('pw'), 'pw') == (True, True)
+    assert verify_password('scrypt$broken', 'pw') == (False, False)
+    assert verify_password(None, '') == (False, True)
+
+
+def test_weak_pbkdf2_is_flagged_for_rehash(monkeypatch):
+    assert verify_password(pbkdf2('pw', 1000), 'pw') == (True, True)
+    assert verify_password(pbkdf2('pw', 1000), 'nope')[0] is False
+    monkeypatch.setattr(auth, 'PBKDF2_ITERATIONS', 1000)
+    monkeypatch.delattr(auth.hashlib, 'scrypt')   # where scrypt is missing, current pbkdf2 is kept
+    assert verify_password(pbkdf2('pw', 1000), 'pw') == (True, False)
+
+
+def test_login_refuses_wrong_password_and_unknown_user(svc):
+    assert svc.login('ann', 'secret').email == 'ann@example.org'
+    with pytest.raises(ServiceError, match='Invalid cred'): svc.login('ann', 'wrong')
+    with pytest.raises(ServiceError, match='Invalid cred'): svc.login('nobody', 'secret')
+    with pytest.raises(ServiceError, match='Invalid cred'): svc.login('ann', None)
+
+
+def test_login_upgrades_a_legacy_hash(svc):
+    svc.store.add_user('bob', legacy_hash('hunter2'), 'bob@example.org')
+    svc.login('bob', 'hunter2')
+    stored = svc.store.get_user('bob').pw_hash
+    assert stored != legacy_hash('hunter2') and verify_password(stored, 'hunter2') == (True, False)
+    svc.login('bob', 'hunter2')
+
+
+def test_throttle_locks_out_then_expires():
+    now = [1000.0]
+    t = Throttle(max_failures=3, window=60, lockout=30, clock=lambda: now[0])
+    key = ('user', 'ann')
+    t.failed(key); t.failed(key)
+    assert t.wait(key) == 0
+    now[0] += 61                     # the first two fall out of the window
+    t.failed(key); t.failed(key)
+    assert t.wait(key) == 0
+    t.failed(key)
+    assert t.wait(key) == 30 and t.wait(('user', 'bob')) == 0
+    now[0] += 29
+    assert t.wait(key) == 1
+    now[0] += 1
+    assert t.wait(key) == 0
+    t.failed(key)                    # the count started over after the lockout
+    assert t.wait(key) == 0
+
+
+def test_login_lockout_and_success_clears_the_user(svc):
+    now = [0.0]
+    svc.throttle = Throttle(clock=lambda: now[0])
+    for _ in range(auth.MAX_FAILURES):
+        with pytest.raises(ServiceError, match='Invalid cred'): svc.login('ann', 'wrong', '10.0.0.7')
+    with pytest.raises(ServiceError, match='Too many attempts'): svc.login('ann', 'secret', '10.0.0.8')
+    with pytest.raises(ServiceError, match='Too many attempts'): svc.admin_login('admin', '1234', '10.0.0.7')
+    now[0] += auth.LOCKOUT
+    svc.login('ann', 'secret', '10.0.0.8')
+    assert svc.throttle.wait(('user', 'ann')) == 0
+
+
+def test_loopback_peers_share_no_address_lockout(svc):
+    svc.throttle = Throttle(clock=lambda: 0.0)
+    for _ in range(auth.MAX_FAILURES):
+        with pytest.raises(ServiceError): svc.login('ann', 'wrong', '127.0.0.1')
+    with pytest.raises(ServiceError, match='Too many attempts'): svc.login('ann', 'secret', '127.0.0.1')
+    svc.admin_login('admin', '1234', '127.0.0.1')   # other desks on the same host still get in
+    svc.register('bob', 'pw', 'bob@example.org')
+    svc.login('bob', 'pw', '::1')
@@ -0,0 +1,45 @@
+import os
+import pytest
+import bulk
+from storage import open_store
+
+
+def row(**kw):
+    rec = {'Name': 'Rex', 'Species': 'Dog', 'Age': '3', 'Description': 'calm'}
+    rec.update(kw)
+    return rec
+
+
+@pytest.mark.parametrize('rec, reason', [
+    (row(Name=''), 'missing Name'),
+    (row(Species=None, Description='  '), 'missing Species, Description'),
+    ({'Name': 'Rex'}, 'missing Species, Age, Description'),
+    (row(Age='three'), "age is not a number: 'three'"),
+    (row(Age='-1'), 'negative age: -1'),
+    (row(Photo='missing.png'), 'photo not found'),
+])
+def test_validate_rejects(rec, reason, tmp_path):
+    with pytest.raises(ValueError, match=reason): bulk.validate(rec, str(tmp_path))
+
+
+def test_validate_normalises_headers_and_values():
+    rec = {' name ': ' Rex ', 'SPECIES': 'Dog', 'age': 3, 'Description': 'calm', None: 'stray cell'}
+    assert bulk.validate(rec) == ('Rex', 'Dog', '3', 'calm', '')
+
+
+def test_relative_photo_paths_resolve_against_the_source_file(tmp_path, monkeypatch):
+    (tmp_path / 'photos').mkdir()
+    (tmp_path / 'photos' / 'rex.png').write_bytes(b'')
+    assert bulk.validate(row(Photo='photos/rex.png'), str(tmp_path))[4] == os.path.join(str(tmp_path), 'photos/rex.png')
+    absolute = str(tmp_path / 'photos' / 'rex.png')
+    assert bulk.validate(row(Photo=absolute), '/elsewhere')[4] == absolute
+
+    src = tmp_path / 'partner.csv'
+    src.write_text('Name,Species,Age,Description,Photo\n'
+                   'Rex,Dog,3,calm,photos/rex.png\n'
+                   'Tom,Cat,x,shy,\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path / 'photos')   # not the directory of the source file
+    store = open_store(str(tmp_path / 'animal_data.db'))
+    report = bulk.import_animals(store, str(src))
+    assert [(a.name, a.photo) for a in report.added] == [('Rex', os.path.join(str(tmp_path), 'photos/rex.png'))]
+    assert [(n, reason) for n, _, reason in report.rejected] == [(3, "age is not a number: 'x'")]
@@ -0,0 +1,73 @@
+"""decide_many: batched accept/reject decisions and their conflicts, on both stores."""
+import pytest
+from service import RescueService
+
+
+@pytest.fixture(params=['xlsx', 'db'])
+def svc(request, tmp_path):
+    return RescueService.open(str(tmp_path / f'animal_data.{request.param}'))
+
+
+def register(svc, *users):
+    for user in users: svc.store.add_user(user, '', f'{user}@example.org')
+
+
+def test_decide_many_resolves_conflicts(svc):
+    register(svc, 'ann', 'bob', 'cat')
+    rex = svc.add_animal('Rex', 'Dog', '3', 'calm').id
+    tom = svc.add_animal('Tom', 'Cat', '2', 'shy').id
+    for user in ('ann', 'bob', 'cat'): svc.request_adoption(rex, user, f'{user}@example.org')
+    svc.request_adoption(tom, 'ann', 'ann@example.org')
+
+    report = svc.decide_many([(rex, 'ann', True), (rex, 'bob', True), (rex, 'cat', False),
+                              (tom, 'nobody', True), (tom, 'ann', False)])
+    key = lambda qs: sorted((q.animal_id, q.username) for q in qs)
+    assert key(report.accepted) == [(rex, 'ann')]
+    assert key(report.rejected) == [(rex, 'cat'), (tom, 'ann')]
+    assert key(report.auto_rejected) == [(rex, 'bob')]   # reported once, not also as skipped
+    assert report.skipped == [((tom, 'nobody'), 'Request not found')]
+    assert svc.requests() == [] and svc.pending_count() == 0
+
+    svc.request_adoption(tom, 'bob', 'bob@example.org')
+    report = svc.decide_many([(tom, 'bob', True), (rex, 'bob', True)])
+    assert key(report.accepted) == [(tom, 'bob')]
+    assert report.skipped == [((rex, 'bob'), 'Already adopted by ann')]
+
+    svc.flush()
+    again = RescueService.open(svc.store.path)
+    assert sorted((x.animal_id, x.username) for x in again.adoptions()) == [(rex, 'ann'), (tom, 'bob')]
+
+
+def test_accept_after_another_desk_adopted_is_skipped(svc):
+    register(svc, 'ann', 'bob')
+    rex = svc.add_animal('Rex', 'Dog', '3', 'calm').id
+    for user in ('ann', 'bob'): svc.request_adoption(rex, user, f'{user}@example.org')
+    svc.flush()
+    other = RescueService.open(svc.store.path)
+    stale = svc.adoption_status()
+    svc.adoption_status = lambda: stale   # this desk checked before the other one's accept landed
+
+    other.decide_many([(rex, 'ann', True)])
+    other.flush()
+    report = svc.decide_many([(rex, 'bob', True)])
+    assert report.accepted == [] and [key for key, _ in report.skipped] == [(rex, 'bob')]
+    svc.flush()
+    assert [(x.animal_id, x.username) for x in RescueService.open(svc.store.path).adoptions()] == [(rex, 'ann')]
+
+
+def test_concurrent_accepts_keep_one_adoption(svc):
+    # neither desk has flushed when both decide: on Excel the first journal to reach the file wins
+    a = svc
+    register(a, 'ann', 'bob')
+    rex = a.add_animal('Rex', 'Dog', '3', 'calm').id
+    for user in ('ann', 'bob'): a.request_adoption(rex, user, f'{user}@example.org')
+    a.flush()
+    b = RescueService.open(a.store.path)
+
+    a.decide_many([(rex, 'ann', True)])
+    b.decide_many([(rex, 'bob', True)])
+    a.flush(); b.flush()
+
+    s = RescueService.open(a.store.path)
+    assert [(x.animal_id, x.username) for x in s.adoptions()] == [(rex, 'ann')]
+    assert s.requests() == []
@@ -0,0 +1,65 @@
+"""Journal, checkpoint and merge behaviour of ExcelStore."""
+import json
+import pytest
+from storage import ExcelStore, Request, ensure_excel
+
+
+@pytest.fixture
+def path(tmp_path):
+    p = str(tmp_path / 'animal_data.xlsx')
+    ensure_excel(p)
+    return p
+
+
+def journal_lines(path):
+    with open(path + '.journal', 'rb') as f: return f.read().splitlines(keepends=True)
+
+
+def test_torn_journal_line_is_ignored_and_truncated(path):
+    s = ExcelStore(path)
+    s.add_animal('Rex', 'Dog', '3', 'calm')
+    s.flush()
+    with open(path + '.journal', 'ab') as f: f.write(b'{"seq": 2, "op": "add_an')   # crash mid-append
+
+    s = ExcelStore(path)
+    assert [a.name for a in s.animals()] == ['Rex']
+    s.add_animal('Tom', 'Cat', '2', 'shy')
+    s.flush()
+    lines = journal_lines(path)
+    assert all(line.endswith(b'\n') for line in lines)
+    assert [json.loads(line)['seq'] for line in lines] == [1, 2]
+    assert [a.name for a in ExcelStore(path).animals()] == ['Rex', 'Tom']
+
+
+def test_crash_between_save_and_journal_truncate(path):
+    s = ExcelStore(path)
+    s.add_animal('Rex', 'Dog', '3', 'calm')
+    s.flush()
+    stale = b''.join(journal_lines(path))
+    s.checkpoint()
+    with open(path + '.journal', 'wb') as f: f.write(stale)   # the truncate never happened
+
+    s = ExcelStore(path)
+    assert [a.name for a in s.animals()] == ['Rex']   # seq 1 <= JournalSeq: not applied twice
+    s.add_animal('Tom', 'Cat', '2', 'shy')
+    s.flush()
+    assert [(a.id, a.name) for a in ExcelStore(path).animals()] == [(1, 'Rex'), (2, 'Tom')]
+
+
+def test_merge_remaps_animal_ids_inside_a_batch(path):
+    a, b = ExcelStore(path), ExcelStore(path)
+    a.add_animal('Rex', 'Dog', '3', 'calm')
+    a.flush()
+
+    tom = b.add_animal('Tom', 'Cat', '2', 'shy')   # also ID 1 on this desk
+    with b.batch():
+        b.add_request(tom.id, tom.name, 'ann', 'ann@example.org')
+        b.add_request(tom.id, tom.name, 'bob', 'bob@example.org')
+        b.add_adoption(tom.id, tom.name, 'ann', 'ann@example.org')
+        b.remove_requests([(tom.id, 'ann')])
+    b.flush()   # merges onto a's data: Tom becomes 2, and so do the ops in the batch
+
+    s = ExcelStore(path)
+    assert [(x.id, x.name) for x in s.animals()] == [(1, 'Rex'), (2, 'Tom')]
+    assert s.requests() == [Request(2, 'Tom', 'bob', 'bob@example.org')]
+    assert [(x.animal_id, x.username) for x in s.adoptions()] == [(2, 'ann')]
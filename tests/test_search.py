@@ -0,0 +1,51 @@
+from search import AnimalIndex
+from storage import Animal
+
+
+def animals():
+    return [Animal(1, 'Rex', 'Dog', '3', 'Friendly labrador', ''),
+            Animal(2, 'Bella', 'Cat', '1', 'Shy tabby', ''),
+            Animal(3, 'Rexy', 'Dog', 'unknown', 'Loves kids', ''),
+            Animal(4, 'Max', 'Rabbit', '7', 'Friendly and calm', '')]
+
+
+def ids(found):
+    return [a.id for a in found]
+
+
+def test_prefix_search_matches_every_word():
+    idx = AnimalIndex(animals())
+    assert ids(idx.search('rex')) == [1, 3]
+    assert ids(idx.search('REX dog')) == [1, 3]
+    assert ids(idx.search('frie')) == [1, 4]
+    assert ids(idx.search('frie lab')) == [1]
+    assert idx.search('zebra') == []
+    assert ids(idx.search('')) == [1, 2, 3, 4]
+
+
+def test_age_bounds_are_inclusive_and_skip_non_numeric():
+    idx = AnimalIndex(animals())
+    assert ids(idx.search(min_age=3)) == [1, 4]
+    assert ids(idx.search(max_age=3)) == [1, 2]
+    assert ids(idx.search(min_age=1, max_age=3)) == [1, 2]
+    assert ids(idx.search('rex', min_age=0)) == [1]
+
+
+def test_sorting():
+    idx = AnimalIndex(animals())
+    assert ids(idx.search(sort='name')) == [2, 4, 1, 3]
+    assert ids(idx.search(sort='age')) == [2, 1, 4, 3]       # no numeric age goes last
+    assert ids(idx.search(sort='species', reverse=True)) == [4, 3, 1, 2]
+
+
+def test_incremental_add_remove_update_match_a_full_build():
+    idx = AnimalIndex(animals()[:2])
+    for a in animals()[2:]: idx.add(a)
+    idx.update(Animal(2, 'Bella', 'Cat', '9', 'Calm tabby', ''))
+    idx.remove(1)
+    idx.remove(99)                                           # unknown ids are ignored
+    rebuilt = AnimalIndex([Animal(2, 'Bella', 'Cat', '9', 'Calm tabby', '')] + animals()[2:])
+    assert (idx.vocab, idx.ages) == (rebuilt.vocab, rebuilt.ages)
+    assert ids(idx.search('calm')) == [2, 4]
+    assert 'labrador' not in idx.vocab
+    assert ids(idx.search(min_age=8)) == [2]
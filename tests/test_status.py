@@ -0,0 +1,49 @@
+from status import AdoptionStatus, AVAILABLE, PENDING, ADOPTED
+from storage import Adoption, Request
+
+
+def req(aid, user): return Request(aid, f'animal {aid}', user, f'{user}@example.org')
+
+
+def adoption(aid, user): return Adoption(aid, f'animal {aid}', user, f'{user}@example.org')
+
+
+def test_available_to_pending_to_adopted():
+    st = AdoptionStatus()
+    assert st.state(1) == (AVAILABLE, None)
+    st.add_request(req(1, 'ann'))
+    st.add_request(req(1, 'bob'))
+    st.add_request(req(1, 'ann'))                    # a repeat is not counted twice
+    assert st.state(1) == (PENDING, ['ann', 'bob'])
+    assert st.pending_total == 2
+    assert st.requested_by(1, 'ann') and not st.requested_by(1, 'cat') and not st.requested_by(2, 'ann')
+    assert st.request(1, 'bob') == req(1, 'bob') and st.request(1, 'cat') is None
+    assert st.requests_for(1) == [req(1, 'ann'), req(1, 'bob')]
+
+    st.remove_request(1, 'ann')
+    st.add_adoption(adoption(1, 'ann'))
+    assert st.state(1) == (ADOPTED, 'ann')          # adopted wins over the request still pending
+    st.remove_request(1, 'bob')
+    assert st.pending_total == 0 and st.requests_for(1) == [] and 1 not in st.pending
+
+
+def test_removing_the_last_request_makes_an_animal_available_again():
+    st = AdoptionStatus(requests=[req(1, 'ann')])
+    st.remove_request(1, 'ann')
+    st.remove_request(1, 'ann')                      # unknown requests are ignored
+    st.remove_request(2, 'bob')
+    assert st.state(1) == (AVAILABLE, None) and st.pending_total == 0
+    assert st.for_user('ann') == ([], [])
+
+
+def test_first_adoption_of_an_animal_stands():
+    st = AdoptionStatus([adoption(1, 'ann'), adoption(1, 'bob')])
+    assert st.state(1) == (ADOPTED, 'ann')
+
+
+def test_for_user_matches_the_tables_it_was_built_from():
+    st = AdoptionStatus([adoption(1, 'ann')], [req(2, 'ann'), req(3, 'ann'), req(2, 'bob')])
+    assert st.for_user('ann') == ([adoption(1, 'ann')], [req(2, 'ann'), req(3, 'ann')])
+    assert st.for_user('bob') == ([], [req(2, 'bob')])
+    assert st.for_user('nobody') == ([], [])
+    assert st.pending_total == 3
@@ -0,0 +1,168 @@
+from collections import OrderedDict
+import hashlib, os, threading
+import perf
+
+# --------------------------------------- CONFIG ---------------------------------------
+THUMB_DIR = '.thumbs'
+THUMB_BUDGET = 64 * 1024 * 1024   # bytes of decoded PhotoImages kept in memory
+THUMB_QUALITY = 85
+GRID_SIZE = (200, 200)   # animal grids (view animals, adopt dialog)
+CARD_SIZE = (180, 180)   # request and adoption cards
+THUMB_SIZES = (GRID_SIZE, CARD_SIZE)   # what precompute() renders for every photo
+PRECOMPUTE_WORKERS = None   # processes; None = one per core
+
+# ---------------------------------- THUMBNAIL CACHE ----------------------------------
+class ThumbnailCache:
+    """Downscaled animal photos, cached on disk and as PhotoImages in memory.
+
+    Entries are keyed by (path, mtime, size), so replacing a photo on disk
+    invalidates its thumbnails. The in-memory side is an LRU bounded by the
+    decoded size of the images (width * height * 4 bytes each).
+    """
+
+    def __init__(self, cache_dir=THUMB_DIR, budget=THUMB_BUDGET):
+        self.dir = cache_dir
+        self.budget = budget
+        self.photos = OrderedDict()   # key -> (PhotoImage, bytes)
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def key(self, path, size):
+        return (os.path.abspath(path), os.path.getmtime(path), tuple(size))
+
+    def disk_path(self, key):
+        return os.path.join(self.dir, hashlib.sha1(repr(key).encode()).hexdigest() + '.jpg')
+
+    def decode(self, path, size):
+        """PIL image of `path` shrunk to fit `size`, read from the disk cache when present."""
+        key = self.key(path, size)
+        img = self.cached(key)
+        if img is None:
+            img = self.shrink(path, size)
+            self.save(key, img)
+        return img
+
+    def cached(self, key):
+        from PIL import Image   # loaded with the first photo, not at startup
+        try:
+            img = Image.open(self.disk_path(key)); img.load()
+        except OSError:
+            return None
+        with self.lock: self.disk_hits += 1
+        return img
+
+    def shrink(self, path, size):
+        from PIL import Image
+        with perf.span('decode_image', path=path) as info:
+            img = Image.open(path)
+            info['file_bytes'] = os.path.getsize(path)
+            img.draft('RGB', size)   # let the JPEG decoder skip straight to a smaller scale
+            img = img.convert('RGB')
+            perf.count('image_bytes_decoded', img.width * img.height * 3)
+            img.thumbnail(size)
+        return img
+
+    def save(self, key, img):
+        thumb = self.disk_path(key)
+        os.makedirs(self.dir, exist_ok=True)
+        tmp = f'{thumb}.{os.getpid()}.{threading.get_ident()}.tmp'
+        img.save(tmp, 'JPEG', quality=THUMB_QUALITY)
+        os.replace(tmp, thumb)
+
+    def missing(self, path, sizes=THUMB_SIZES):
+        """The sizes of `path` not yet in the disk cache."""
+        return [s for s in sizes if not os.path.exists(self.disk_path(self.key(path, s)))]
+
+    def render(self, path, sizes=THUMB_SIZES):
+        """Write the missing sizes of `path` to the disk cache, decoding the photo only once."""
+        sizes = sorted(self.missing(path, sizes), key=lambda s: s[0] * s[1], reverse=True)
+        img = None
+        for size in sizes:   # largest first; each smaller one is shrunk from the previous
+            if img is None: img = self.shrink(path, size)
+            else: img = img.copy(); img.thumbnail(size)
+            self.save(self.key(path, size), img)
+        return len(sizes)
+
+    def precompute(self, paths, sizes=THUMB_SIZES, workers=PRECOMPUTE_WORKERS, progress=None):
+        """Render `sizes` of every photo in `paths` into the disk cache, one process per core.
+
+        Photos already cached are skipped, and a single photo (e.g. one just
+        uploaded) is rendered in this process. Returns {path: error} for the
+        photos that could not be decoded.
+        """
+        todo = sorted({os.path.abspath(p) for p in paths if p and os.path.exists(p)})
+        todo = [p for p in todo if self.missing(p, sizes)]
+        failed = {}
+        if len(todo) < 2:
+            for p in todo:
+                try: self.render(p, sizes)
+                except Exception as e: failed[p] = e
+            return failed
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        # spawn, not fork: the app calls this with Tk and worker threads running
+        with perf.span('precompute_thumbs', photos=len(todo)), \
+             ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {pool.submit(_render, self.dir, p, sizes): p for p in todo}
+            for n, f in enumerate(as_completed(futures), 1):
+                try: f.result()
+                except Exception as e: failed[futures[f]] = e
+                if progress: progress(n, len(todo))
+        return failed
+
+    def lookup(self, path, size):
+        """PhotoImage from memory, or None on a miss (which the caller then decodes)."""
+        key = self.key(path, size)
+        with self.lock:
+            entry = self.photos.get(key)
+            if entry:
+                self.photos.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def add(self, path, size, img):
+        """Wrap an image from decode() in a PhotoImage and cache it; Tk thread only."""
+        from PIL import ImageTk
+        with perf.span('photo_image'): photo = ImageTk.PhotoImage(img)
+        self.put(self.key(path, size), photo, img.width * img.height * 4)
+        return photo
+
+    def put(self, key, photo, nbytes):
+        with self.lock:
+            old = self.photos.pop(key, None)
+            if old: self.bytes -= old[1]
+            self.photos[key] = (photo, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.budget and len(self.photos) > 1:
+                _, (_, n) = self.photos.popitem(last=False)
+                self.bytes -= n
+                self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'disk_hits': self.disk_hits,
+                    'evictions': self.evictions, 'entries': len(self.photos), 'bytes': self.bytes}
+
+
+def _render(cache_dir, path, sizes):
+    # precompute() worker; top level so the process pool can pickle it
+    return ThumbnailCache(cache_dir).render(path, sizes)
+
+# ----------------------------------------- CLI -----------------------------------------
+if __name__ == '__main__':
+    import argparse
+    from storage import open_store, EXCEL_FILE
+    ap = argparse.ArgumentParser(description='Render the thumbnails of every animal photo ahead of time.')
+    ap.add_argument('--data', default=os.environ.get('RESCUE_DATA', EXCEL_FILE), help='data file (.xlsx or .db)')
+    ap.add_argument('--cache-dir', default=THUMB_DIR)
+    ap.add_argument('--workers', type=int, default=PRECOMPUTE_WORKERS)
+    args = ap.parse_args()
+
+    paths = {a.photo for a in open_store(args.data).animals() if a.photo}
+    failed = ThumbnailCache(args.cache_dir).precompute(paths, workers=args.workers,
+                                                       progress=lambda n, total: print(f'rendered {n}/{total} photos', end='\r'))
+    print(f'\n{len(paths)} photos, {len(failed)} failed')
+    for path, e in sorted(failed.items())[:20]: print(f'  {path}: {e}')